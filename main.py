@@ -1,3 +1,4 @@
+from wordle.cache import SolvedCache
 from wordle.wordle import wordle
 
 if __name__ == "__main__":
@@ -20,11 +21,12 @@ if __name__ == "__main__":
     ]
     with open("words/words.txt") as fh:
         words = fh.read().split("\n")
+    cache = SolvedCache("solved.sqlite")
     # board = wordle(words, "allay", initial_guess="crate", soft=True)
     results = []
     for i, word in enumerate(reversed(words)):
         print(word)
-        board = wordle(words, word, initial_guess="crate", soft=True)
+        board = wordle(words, word, initial_guess="crate", soft=True, cache=cache)
         print(board)
         results.append(board.score())
         if i and not i % 25:
@@ -1,153 +1,169 @@
 """
->>> wdl = Wordle("rasps")
+Feedback is a code from ``wordle.evaluate``, parsed from and formatted to
+strings like ``'.--..'`` only where people read and type it.
+
+>>> vocabulary = Vocabulary(["rasps", "crate", "rates"])
+>>> wdl = Wordle(UserGuesser(vocabulary), AutoScorer("rasps"), vocabulary)
 >>> wdl.guess("crate")
 >>> wdl.score()
-'.--..'
+12
 >>> wdl.guess("rates")
 >>> wdl.score()
-'==..='
+170
 >>> wdl.guess("rasps")
->>> wdl.score()
-'====='
+>>> wdl.score() == CORRECT_CODE
+True
 >>> wdl.is_terminal()
 True
+>>> print(wdl)
+crate .--..
+rates ==..=
+rasps =====
 """
+
 from __future__ import annotations
 import argparse
 import functools
+import itertools
+import json
 import logging
+import math
+import multiprocessing
+import os
 import random
+import time
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
 from typing import Iterator, Protocol, Self
 
-from search.alphabeta import alphabeta
-
+from search.alphabeta import Table, alphabeta
+from search.expectimax import expectimax_move
+from search.mcts import MCTS
+from wordle.cache import SolvedCache, position_key
+from wordle.costs import CostModel, Position, calibrate
+from wordle.evaluate import CORRECT_CODE, POWERS, WRONG_CODE, decode, feedback, parse
+from wordle.halving import Schedule, select
+from wordle.models import Vocabulary, Words, new_words
+from wordle.prune import bucket_sizes, expected_size, partition, prune
 
 logger = logging.getLogger(__name__)
 
 
-CORRECT_GUESS = "====="
-COMPLETELY_WRONG = "....."
-MINIMUM_NODE = "_____"
-MAXIMUM_NODE = "^^^^^"
+# Moves of the bounding nodes, distinct from word ids and feedback codes.
+MINIMUM_NODE = -1
+MAXIMUM_NODE = -2
 
 
-@functools.cache
-def present(aim: str, guess: str, guessc: str, i: int) -> str:
-    if i > 0:
-        count_aimc = len([c for c in aim if c == guessc])
-        count_stats = len([c for c in guess[:i] if c == guessc])
-        if count_aimc <= count_stats:
-            return "."
-    return "-"
+# Utility of failing to guess in six, as if it took a seventh.
+FAILED_UTILITY = -7.0
+# Possible answers a rollout compares before guessing.
+ROLLOUT_SAMPLE = 5
+# A good first guess, and reply when it misses every letter, if allowed.
+OPENER = "crate"
+OPENER_MISSED = "bogus"
 
 
-@functools.cache
-def evaluate(aim: str, guess: str) -> str:
-    status = ""
-    for i, (aimc, guessc) in enumerate(zip(aim, guess)):
-        if aimc == guessc:
-            status += "="
-        elif guessc in aim:
-            status += present(aim=aim, guess=guess, guessc=guessc, i=i)
-        else:
-            status += "."
-    return status
+def estimate_guesses(n: int) -> float:
+    """Rough number of guesses to find one of ``n`` words.
+
+    >>> estimate_guesses(1), round(estimate_guesses(10), 2)
+    (1.0, 2.41)
+    """
+    if n <= 1:
+        return float(n)
+    return 1 + (n - 1) / n * (1 + math.log(n, 60))
 
 
 @functools.cache
-def score_evaluation(sc: str) -> int:
+def score_evaluation(sc: int) -> int:
     logger.debug("score=%s", sc)
     if sc == MINIMUM_NODE:
         return -100
     if sc == MAXIMUM_NODE:
         return 100
-    scores = {".": 0, "-": 1, "=": 2}
-    return sum(scores[s] for s in sc)
-
-
-def prune_correct(words: list[str], i: int, c: str) -> list[str]:
-    return [w for w in words if w[i] == c]
-
-
-def prune_present(words: list[str], i: int, c: str) -> list[str]:
-    return [w for w in words if c in w and w[i] != c]
+    # ".": 0, "-": 1, "=": 2
+    return sum(sc // p % 3 for p in POWERS)
+
+
+def best_guesses(
+    vocabulary: Vocabulary,
+    words: Words,
+    guesses: Words,
+    width: int,
+    schedule: Schedule | None = None,
+    seed: int | None = None,
+) -> Words:
+    """The ``width`` guesses leaving fewest words expected, possible answers first.
+
+    With a ``schedule`` guesses are first narrowed down by successive halving
+    on samples of more than ``schedule.sample`` words.
+
+    >>> vocabulary = Vocabulary(["abbot", "scorn", "today", "crate"])
+    >>> words = vocabulary.all()
+    >>> vocabulary.decode(best_guesses(vocabulary, words, words, 2))
+    ['abbot', 'today']
+    """
+    if schedule is not None and len(words) > schedule.sample:
+        schedule = schedule._replace(finalists=max(width, schedule.finalists))
+        selected = select(vocabulary, words, guesses, schedule, seed)
+        return new_words(guess for _, guess in selected[:width])
+    candidates = set(words)
+    ranked = []
+    for guess in guesses:
+        sizes = bucket_sizes(vocabulary, guess, words)
+        ranked.append((expected_size(sizes), guess not in candidates, guess))
+    return new_words(guess for *_, guess in sorted(ranked)[:width])
 
 
-def prune_missing(
-    words: list[str], i: int, c: str, status: str, guess: str
-) -> list[str]:
-    # Character with missing may be present elsewhere in the word
-    # return [w for w in words if w[i] != c]
-    if [s for s, c_ in zip(status, guess) if c_ == c and s != "."]:
-        return [w for w in words if c in w and w[i] != c]
-    return [w for w in words if c not in w]
+@functools.cache
+def opening_guess(vocabulary: Vocabulary) -> str:
+    """``OPENER`` if it may be guessed, otherwise the best by ``best_guesses``.
 
+    Guesses for the many answers of the opening are narrowed down by
+    successive halving, once per vocabulary.
 
-def prune(
-    words: list[str],
-    guesses: list[str],
-    scores: list[str],
-    final_only: bool = True,
-) -> list[str]:
-    if len(guesses) != len(scores):
-        raise ValueError(
-            "Pruning with different sizes guesses and scores not supported"
-        )
-    for guess, score in zip(reversed(guesses), reversed(scores)):
-        if score == CORRECT_GUESS:
-            return [guess]
-        else:
-            words = [w for w in words if w != guess]
-
-        for i, (c, s) in enumerate(zip(guess, score)):
-            match s:
-                case "=":
-                    words = prune_correct(words, i, c)
-                case "-":
-                    words = prune_present(words, i, c)
-                case ".":
-                    words = prune_missing(words, i, c, score, guess)
-                case _:
-                    raise ValueError(f"Unkown evaluation.")
-        if final_only:
-            break
-    return words
+    >>> opening_guess(Vocabulary(["abbot", "scorn", "today"]))
+    'abbot'
+    """
+    if OPENER in vocabulary:
+        return OPENER
+    answers, allowed = vocabulary.answers, vocabulary.all()
+    (best,) = best_guesses(vocabulary, answers, allowed, 1, Schedule(), seed=0)
+    logger.info("%s is not allowed, opening with %s", OPENER, vocabulary.word(best))
+    return vocabulary.word(best)
 
 
 class Guesser(Protocol):
-    def __call__(self, guesses: list[str], scores: list[str]) -> str:
-        ...
+    def __call__(self, guesses: list[str], scores: list[int]) -> str: ...
 
 
 class Scorer(Protocol):
-    def __call__(self, guess: str) -> str:
-        ...
+    def __call__(self, guess: str) -> int: ...
 
 
 class AutoScorer:
     def __init__(self, truth: str) -> None:
         self.truth = truth
 
-    def __call__(self, guess: str) -> str:
-        return evaluate(self.truth, guess)
+    def __call__(self, guess: str) -> int:
+        return feedback(self.truth, guess)
 
 
 class UserScorer:
-    def __call__(self, guess: str) -> str:
+    def __call__(self, guess: str) -> int:
         print(f"Guess: {guess}")
         while True:
-            score = input("Score: ").strip().lower()
-            if len(score) != 5:
-                print("Score must be 5 letters long. Enter another.")
-                continue
-            return score
+            try:
+                return parse(input("Score: "))
+            except ValueError as e:
+                print(f"{e} Enter another.")
 
 
 class UserGuesser:
-    def __init__(self, vocabulary: list[str]) -> None:
+    def __init__(self, vocabulary: Vocabulary) -> None:
         self.vocabulary = vocabulary
 
-    def __call__(self, guesses: list[str], scores: list[str]) -> str:
+    def __call__(self, guesses: list[str], scores: list[int]) -> str:
         while True:
             guess = input("Guess: ").strip().lower()
             if len(guess) != 5:
@@ -166,20 +182,45 @@ class WordleNode:
     The minimising player chooses the lowest score that guess could have attained,
     given the allowed words.
 
+    Moves alternate guessed word ids and feedback codes.
+    Children share their parent's words, only pruning makes new ones.
+    ``words`` are the possible answers left, the minimising player's moves.
+    ``guesses`` are the maximising player's moves, the words left if not given.
+
+    With ``chance`` the minimising player is replaced by chance: each feedback
+    is an outcome weighted by the number of words giving it, and utility is
+    minus the number of guesses, so expectimax minimises the mean guesses.
+    With ``width`` only that many guesses are tried at maximising nodes,
+    those leaving the fewest words expected first.
+    With ``keep`` nodes keep the children they generate, pruned words and
+    all, so a later search of the subtree does not generate them again.
+
     """
 
-    moves: list[str]
+    moves: list[int]
 
     def __init__(
         self,
-        moves: list[str],
-        vocabulary: list[str],
+        moves: list[int],
+        vocabulary: Vocabulary,
+        words: Words,
         depth: int = 1,
+        guesses: Words | None = None,
+        chance: bool = False,
+        width: int | None = None,
+        keep: bool = False,
     ) -> None:
         self.moves = moves
         self.vocabulary = vocabulary
+        self.words = words
+        self.guesses = guesses
         self.depth = depth
-        if vocabulary:
+        self.chance = chance
+        self.width = width
+        self.keep = keep
+        self.expanded: list[WordleNode] = []
+        self._unexpanded: Iterator[WordleNode] | None = None
+        if words:
             logger.debug("create node %s %s %s", moves, depth, self.is_terminal())
 
     def __lt__(self, other: Self) -> bool:
@@ -205,84 +246,648 @@ class WordleNode:
         # but maybe only with soft alphabeta
         if self.depth > 4:
             return 0
-        return len(set(self.moves[-1]))
+        return len(set(decode(self.moves[-1])))
 
     def is_maximising(self) -> bool:
         return bool(self.depth % 2)
 
     def is_terminal(self) -> bool:
         no_more_guesses = self.depth == 13
-        correct_guess = bool(self.moves) and self.moves[-1] == CORRECT_GUESS
-        return no_more_guesses or correct_guess
+        return no_more_guesses or self.is_solved()
+
+    def is_solved(self) -> bool:
+        # only maximising nodes follow feedback, elsewhere the last move is
+        # a word id, which may well equal the code of a correct guess
+        return self.is_maximising() and self.moves[-1:] == [CORRECT_CODE]
 
-    def children(self) -> Iterator[Self]:
+    def is_chance(self) -> bool:
+        return self.chance and not self.is_maximising()
+
+    def children(self) -> Iterator[WordleNode]:
+        if not self.keep:
+            yield from self.expand()
+            return
+        for i in itertools.count():
+            if i == len(self.expanded):
+                if self._unexpanded is None:
+                    self._unexpanded = self.expand()
+                if (child := next(self._unexpanded, None)) is None:
+                    return
+                self.expanded.append(child)
+            yield self.expanded[i]
+
+    def child(self, move: int) -> WordleNode | None:
+        """The kept child played ``move``, if generated."""
+        return next((c for c in self.expanded if c.moves[-1] == move), None)
+
+    def expand(self) -> Iterator[WordleNode]:
         if self.is_maximising():
             self.prune()
-            for guess in self.vocabulary:
+            guesses = self.words if self.guesses is None else self.guesses
+            if self.width is not None:
+                guesses = self.best_guesses(guesses, self.width)
+            for guess in guesses:
                 yield WordleNode(
                     moves=self.moves + [guess],
-                    vocabulary=[w for w in self.vocabulary],
+                    vocabulary=self.vocabulary,
+                    words=self.words,
                     depth=self.depth + 1,
+                    guesses=self.guesses,
+                    chance=self.chance,
+                    width=self.width,
+                    keep=self.keep,
                 )
         else:
             # this only needs to be each _evaluation_
             # multiple words lead to the same evaluation.
-            for guess in self.vocabulary:
-                sc = evaluate(guess=self.moves[-1], aim=guess)
+            row = self.vocabulary.row(self.moves[-1])
+            for aim in self.words:
+                sc = row[aim]
                 logger.debug("%s %s", self.moves, sc)
                 yield WordleNode(
                     moves=self.moves + [sc],
-                    vocabulary=[w for w in self.vocabulary],
+                    vocabulary=self.vocabulary,
+                    words=self.words,
                     depth=self.depth + 1,
+                    guesses=self.guesses,
+                    chance=self.chance,
+                    width=self.width,
+                    keep=self.keep,
                 )
 
+    def outcomes(self) -> Iterator[tuple[float, WordleNode]]:
+        n = len(self.words)
+        buckets = partition(self.vocabulary, self.moves[-1], self.words)
+        for sc, bucket in sorted(buckets.items(), key=lambda b: -len(b[1])):
+            yield len(bucket) / n, WordleNode(
+                moves=self.moves + [sc],
+                vocabulary=self.vocabulary,
+                words=bucket,
+                depth=self.depth + 1,
+                guesses=self.guesses,
+                chance=self.chance,
+                width=self.width,
+            )
+
+    def utility(self) -> float:
+        if self.is_solved():
+            return -((self.depth - 1) // 2)
+        if self.depth >= 13:
+            return FAILED_UTILITY
+        # guesses made so far, at both maximising and chance nodes
+        made = self.depth // 2
+        if self.is_maximising():
+            left = estimate_guesses(len(self.words))
+        else:
+            buckets = partition(self.vocabulary, self.moves[-1], self.words)
+            left = sum(
+                len(bucket) / len(self.words) * estimate_guesses(len(bucket))
+                for sc, bucket in buckets.items()
+                if sc != CORRECT_CODE
+            )
+        return max(FAILED_UTILITY, -(made + left))
+
+    def best_guesses(self, guesses: Words, width: int) -> Words:
+        return best_guesses(self.vocabulary, self.words, guesses, width)
+
     def prune(self) -> None:
         if len(self.moves) < 2:
             return
-        self.vocabulary = prune(
-            words=self.vocabulary,
+        self.words = prune(
+            self.vocabulary,
+            words=self.words,
             guesses=self.moves[-2:-1],
-            scores=self.moves[-1:],
-            final_only=True,
+            statuses=self.moves[-1:],
         )
 
     def maximum(self) -> WordleNode:
-        return WordleNode(vocabulary=[], moves=[MAXIMUM_NODE])
+        return WordleNode(
+            moves=[MAXIMUM_NODE], vocabulary=self.vocabulary, words=new_words()
+        )
 
     def minimum(self) -> WordleNode:
-        return WordleNode(vocabulary=[], moves=[MINIMUM_NODE])
+        return WordleNode(
+            moves=[MINIMUM_NODE], vocabulary=self.vocabulary, words=new_words()
+        )
 
 
-class AlphaBetaGuesser:
-    def __init__(self, vocabulary: list[str]) -> None:
+class ExpectimaxGuesser:
+    """Minimises the expected number of guesses, looking ``depth`` guesses ahead.
+
+    Only the ``width`` most promising guesses are searched at each turn.
+
+    """
+
+    def __init__(self, vocabulary: Vocabulary, depth: int = 2, width: int = 10):
         self.vocabulary = vocabulary
+        self.depth = depth
+        self.width = width
 
-    def __call__(self, guesses: list[str], scores: list[str]) -> str:
+    def __call__(self, guesses: list[str], scores: list[int]) -> str:
         if not guesses:
-            return "crate"
-        if len(guesses) == 1 and scores[-1] == COMPLETELY_WRONG:
-            return "bogus"
-        vocabulary = prune(
-            words=self.vocabulary,
-            guesses=guesses,
-            scores=scores,
-            final_only=False,
+            return opening_guess(self.vocabulary)
+        guess_ids = self.vocabulary.encode(guesses).tolist()
+        words = prune(
+            self.vocabulary,
+            words=self.vocabulary.answers,
+            guesses=guess_ids,
+            statuses=scores,
         )
         node = WordleNode(
-            moves=[guesses[-1], scores[-1]],
-            vocabulary=vocabulary,
+            moves=[guess_ids[-1], scores[-1]],
+            vocabulary=self.vocabulary,
+            words=words,
+            depth=1 + len(guesses) * 2,
+            guesses=(
+                self.vocabulary.all()
+                if self.vocabulary.has_extra_guesses()
+                else None
+            ),
+            chance=True,
+            width=self.width,
+        )
+        best = expectimax_move(
+            node, depth=2 * self.depth, lower=FAILED_UTILITY, upper=0.0
+        )
+        best_move = self.vocabulary.word(best.moves[-1])
+        logger.info("best move=%s", best_move)
+        return best_move
+
+
+class BeamGuesser:
+    """Minimises the expected number of guesses over a beam of guesses.
+
+    Each position only tries the ``width`` best guesses by ``best_guesses``,
+    expanding each against its feedback buckets ``depth`` guesses ahead,
+    so a guess costs at most ``width ** depth`` positions whatever the
+    size of the vocabulary. Positions past the depth are estimated.
+    With a ``schedule`` large positions sample their guesses, see ``select``.
+
+    """
+
+    def __init__(
+        self,
+        vocabulary: Vocabulary,
+        depth: int = 2,
+        width: int = 10,
+        schedule: Schedule | None = None,
+        seed: int | None = None,
+    ):
+        self.vocabulary = vocabulary
+        self.depth = depth
+        self.width = width
+        self.schedule = schedule
+        self.rng = random.Random(seed)
+        self.guesses = vocabulary.all() if vocabulary.has_extra_guesses() else None
+        self.values: dict[tuple[bytes, int], tuple[float, int]] = {}
+
+    def __call__(self, guesses: list[str], scores: list[int]) -> str:
+        if not guesses:
+            return opening_guess(self.vocabulary)
+        words = prune(
+            self.vocabulary,
+            words=self.vocabulary.answers,
+            guesses=self.vocabulary.encode(guesses).tolist(),
+            statuses=scores,
+        )
+        self.values.clear()
+        value, guess = self.value(words, self.depth)
+        best_move = self.vocabulary.word(guess)
+        logger.info("best move=%s expected guesses=%s", best_move, value)
+        return best_move
+
+    def value(self, words: Words, depth: int) -> tuple[float, int]:
+        """Expected guesses to find one of ``words`` and the guess to make."""
+        if not words:
+            raise ValueError("No answer fits the scores.")
+        if len(words) == 1:
+            return 1.0, words[0]
+        key = (words.tobytes(), depth)
+        if (cached := self.values.get(key)) is not None:
+            return cached
+        guesses = words if self.guesses is None else self.guesses
+        best = (math.inf, words[0])
+        ranked = best_guesses(
+            self.vocabulary,
+            words,
+            guesses,
+            self.width,
+            schedule=self.schedule,
+            seed=self.rng.randrange(2**32),
+        )
+        for guess in ranked:
+            value = 1.0
+            for sc, bucket in partition(self.vocabulary, guess, words).items():
+                if sc == CORRECT_CODE:
+                    continue
+                if depth > 1:
+                    left, _ = self.value(bucket, depth - 1)
+                else:
+                    left = estimate_guesses(len(bucket))
+                value += len(bucket) / len(words) * left
+            best = min(best, (value, guess))
+        self.values[key] = best
+        return best
+
+
+def greedy_rollout(node: WordleNode, rng: random.Random) -> WordleNode | None:
+    """Guess the best of a few sampled possible answers, by expected words left."""
+    node.prune()
+    if not node.words:
+        return None
+    sample = rng.sample(list(node.words), min(ROLLOUT_SAMPLE, len(node.words)))
+    guess = min(
+        sample,
+        key=lambda g: expected_size(bucket_sizes(node.vocabulary, g, node.words)),
+    )
+    return WordleNode(
+        moves=node.moves + [guess],
+        vocabulary=node.vocabulary,
+        words=node.words,
+        depth=node.depth + 1,
+        guesses=node.guesses,
+        chance=node.chance,
+        width=node.width,
+    )
+
+
+class MCTSGuesser:
+    """Minimises the expected number of guesses by Monte Carlo tree search.
+
+    Searches for ``simulations`` playouts or ``seconds``, whichever ends first,
+    expanding guesses in order of the words they are expected to leave.
+    Playouts guess possible answers greedily, so the quality improves
+    with the budget rather than failing on large vocabularies.
+
+    """
+
+    def __init__(
+        self,
+        vocabulary: Vocabulary,
+        simulations: int | None = 1000,
+        seconds: float | None = None,
+        width: int = 100,
+        seed: int | None = None,
+    ) -> None:
+        self.vocabulary = vocabulary
+        self.simulations = simulations
+        self.seconds = seconds
+        self.width = width
+        self.rng = random.Random(seed)
+
+    def __call__(self, guesses: list[str], scores: list[int]) -> str:
+        if not guesses:
+            return opening_guess(self.vocabulary)
+        guess_ids = self.vocabulary.encode(guesses).tolist()
+        words = prune(
+            self.vocabulary,
+            words=self.vocabulary.answers,
+            guesses=guess_ids,
+            statuses=scores,
+        )
+        if not words:
+            raise ValueError("No answer fits the scores.")
+        if len(words) <= 2:
+            return self.vocabulary.word(words[0])
+        node = WordleNode(
+            moves=[guess_ids[-1], scores[-1]],
+            vocabulary=self.vocabulary,
+            words=words,
             depth=1 + len(guesses) * 2,
+            guesses=(
+                self.vocabulary.all()
+                if self.vocabulary.has_extra_guesses()
+                else None
+            ),
+            chance=True,
+            width=self.width,
+        )
+        search = MCTS(
+            node,
+            value=lambda n: n.utility(),
+            policy=greedy_rollout,
+            exploration=1.0,
+            seed=self.rng.randrange(2**32),
+        )
+        best = search.search(simulations=self.simulations, seconds=self.seconds)
+        best_move = self.vocabulary.word(best.moves[-1])
+        logger.info("best move=%s", best_move)
+        return best_move
+
+
+class AlphaBetaGuesser:
+    """Searches the game with alpha-beta.
+
+    The searched tree and results are kept between turns: the child for the
+    guess and score played becomes the next root and its siblings are dropped.
+
+    """
+
+    def __init__(
+        self,
+        vocabulary: Vocabulary,
+        cache: SolvedCache | None = None,
+    ) -> None:
+        self.vocabulary = vocabulary
+        self.cache = cache
+        self.root: WordleNode | None = None
+        self.history: list[int] = []
+        self.table: Table = {}
+
+    def __call__(self, guesses: list[str], scores: list[int]) -> str:
+        if not guesses:
+            return opening_guess(self.vocabulary)
+        if (
+            guesses == [OPENER]
+            and scores == [WRONG_CODE]
+            and OPENER_MISSED in self.vocabulary
+        ):
+            return OPENER_MISSED
+        guess_ids = self.vocabulary.encode(guesses).tolist()
+        history = [m for moves in zip(guess_ids, scores) for m in moves]
+        words = prune(
+            self.vocabulary,
+            words=self.vocabulary.answers,
+            guesses=guess_ids,
+            statuses=scores,
         )
+        allowed = (
+            self.vocabulary.all() if self.vocabulary.has_extra_guesses() else None
+        )
+        if self.cache is not None:
+            key = position_key(
+                self.vocabulary, words, allowed, namespace="alphabeta"
+            )
+            if (hit := self.cache.get(key, depth=6 - len(guesses))) is not None:
+                return hit[0]
+        node = self.promote(history)
+        if node is None:
+            node = WordleNode(
+                moves=[guess_ids[-1], scores[-1]],
+                vocabulary=self.vocabulary,
+                words=words,
+                depth=1 + len(guesses) * 2,
+                guesses=allowed,
+                keep=True,
+            )
+            self.table = {}
+        self.root, self.history = node, history
         best_guess = alphabeta(
             node,
             a=node.minimum(),
             b=node.maximum(),
             soft=True,
+            table=self.table,
+        )
+        best_move = self.vocabulary.word(best_guess.moves[-2])
+        logger.info("best node move=%s moves=%s", best_move, best_guess.moves)
+        if self.cache is not None:
+            self.cache.put(
+                key,
+                6 - len(guesses),
+                best_move,
+                best_guess.score(),
+                words=self.vocabulary.decode(words),
+            )
+        return best_move
+
+    def promote(self, history: list[int]) -> WordleNode | None:
+        """The last searched tree's node for ``history``, if it was searched."""
+        if self.root is None or history[:-2] != self.history:
+            return None
+        guess, code = history[-2:]
+        if (played := self.root.child(guess)) is None:
+            return None
+        if (node := played.child(code)) is None:
+            return None
+        prefix = tuple(node.moves)
+        self.table = {
+            k: v for k, v in self.table.items() if k[: len(prefix)] == prefix
+        }
+        logger.info("reusing %s searched positions", len(self.table))
+        return node
+
+
+# Guesses and scores of a position pondered.
+Key = tuple[tuple[str, ...], tuple[int, ...]]
+
+
+def ponder_positions(
+    guesser: Guesser,
+    vocabulary: Vocabulary,
+    buckets: int,
+    guesses: list[str],
+    scores: list[int],
+    results: Connection,
+) -> None:
+    """Guess after each of the ``buckets`` likeliest scores of the last guess.
+
+    Each position is sent to ``results`` as ``(key, None, None)`` when its
+    search starts and as ``(key, guess, None)`` when it ends. An error is
+    sent as ``(None, None, error)``.
+
+    """
+    try:
+        words = prune(
+            vocabulary,
+            words=vocabulary.answers,
+            guesses=vocabulary.encode(guesses[:-1]),
+            statuses=scores,
         )
+        partitioned = partition(vocabulary, vocabulary.id(guesses[-1]), words)
+        likeliest = sorted(partitioned, key=lambda sc: -len(partitioned[sc]))
+        for sc in [sc for sc in likeliest if sc != CORRECT_CODE][:buckets]:
+            key = (tuple(guesses), tuple(scores + [sc]))
+            results.send((key, None, None))
+            results.send((key, guesser(list(key[0]), list(key[1])), None))
+    except Exception as e:
+        results.send((None, None, e))
+    finally:
+        results.close()
+
+
+class PonderingGuesser:
+    """Thinks about the next guess while this one is being scored.
+
+    After each guess a background process asks ``guesser`` for the guess
+    after each of the ``buckets`` likeliest scores, those most answers give,
+    so the next guess is usually ready the moment the score is entered.
+    The search for the score entered is waited for, a search for any other
+    is stopped, keeping the guesses pondered so far. An error pondering is
+    raised by the next call.
+
+    The process has a copy of ``guesser``, the state it keeps between calls
+    is not carried back.
+
+    """
+
+    def __init__(self, guesser: Guesser, vocabulary: Vocabulary, buckets: int = 4):
+        self.guesser = guesser
+        self.vocabulary = vocabulary
+        self.buckets = buckets
+        self.process: BaseProcess | None = None
+        self.results: Connection | None = None
+        self.searching: Key | None = None
+        self.pondered: dict[Key, str] = {}
+
+    def __call__(self, guesses: list[str], scores: list[int]) -> str:
+        guess = self.collect((tuple(guesses), tuple(scores)))
+        logger.info("pondered=%s", guess is not None)
+        if guess is None:
+            guess = self.guesser(guesses, scores)
+        self.ponder(guesses + [guess], list(scores))
+        return guess
+
+    def collect(self, key: Key) -> str | None:
+        """The guess pondered for ``key``, if any, once pondering is stopped."""
+        while self.results is not None and key not in self.pondered:
+            # the search for key is worth waiting for, others are not
+            if self.searching != key and not self.results.poll():
+                break
+            try:
+                done, guess, error = self.results.recv()
+            except EOFError:
+                break
+            if error is not None:
+                self.stop()
+                raise error
+            if guess is None:
+                self.searching = done
+            else:
+                self.pondered[done] = guess
+                logger.debug("pondered %s", done)
+        self.stop()
+        return self.pondered.get(key)
+
+    def ponder(self, guesses: list[str], scores: list[int]) -> None:
+        self.stop()
+        self.pondered = {}
+        self.results, sender = multiprocessing.Pipe(duplex=False)
+        self.process = multiprocessing.Process(
+            target=ponder_positions,
+            args=(
+                self.guesser,
+                self.vocabulary,
+                self.buckets,
+                guesses,
+                scores,
+                sender,
+            ),
+            daemon=True,
+        )
+        self.process.start()
+        sender.close()
+
+    def stop(self) -> None:
+        """Stop pondering, abandoning any search in progress."""
+        if self.process is not None:
+            # safe even while writing to a cache, its writes are transactions
+            self.process.terminate()
+            self.process.join()
+            self.process = None
+        if self.results is not None:
+            self.results.close()
+            self.results = None
+        self.searching = None
+
+
+def strategies(vocabulary: Vocabulary) -> dict[str, Guesser]:
+    """Guessers for ``DispatchGuesser``, best first."""
+    return {
+        "alphabeta": AlphaBetaGuesser(vocabulary),
+        "expectimax": ExpectimaxGuesser(vocabulary),
+        "beam": BeamGuesser(vocabulary),
+        "greedy": BeamGuesser(vocabulary, depth=1, width=1),
+    }
+
+
+class DispatchGuesser:
+    """Guesses with the best strategy expected to guess within ``budget`` seconds.
+
+    ``strategies`` are tried best first, their costs predicted by ``model``.
+    If none fits the budget the one predicted quickest guesses.
+    Each choice is logged and, with ``log``, appended to that JSONL file
+    with the time it took, to re-tune the model or the budget.
+
+    """
+
+    def __init__(
+        self,
+        vocabulary: Vocabulary,
+        strategies: dict[str, Guesser],
+        model: CostModel,
+        budget: float = 1.0,
+        log: str | None = None,
+    ) -> None:
+        self.vocabulary = vocabulary
+        self.strategies = {n: g for n, g in strategies.items() if n in model}
+        if not self.strategies:
+            raise ValueError("The cost model has none of the strategies.")
+        self.model = model
+        self.budget = budget
+        self.log = log
+
+    def __call__(self, guesses: list[str], scores: list[int]) -> str:
+        if not guesses:
+            return opening_guess(self.vocabulary)
+        words = prune(
+            self.vocabulary,
+            words=self.vocabulary.answers,
+            guesses=self.vocabulary.encode(guesses).tolist(),
+            statuses=scores,
+        )
+        if not words:
+            raise ValueError("No answer fits the scores.")
+        predicted = {
+            name: self.model.predict(
+                name, len(words), len(guesses), words=len(self.vocabulary)
+            )
+            for name in self.strategies
+        }
+        fits = [name for name, cost in predicted.items() if cost <= self.budget]
+        name = fits[0] if fits else min(predicted, key=lambda n: predicted[n])
+        start = time.perf_counter()
+        guess = self.strategies[name](guesses, scores)
+        seconds = time.perf_counter() - start
         logger.info(
-            "best node move=%s moves=%s", best_guess.moves[-2], best_guess.moves
+            "candidates=%s strategy=%s predicted=%.4f seconds=%.4f",
+            len(words),
+            name,
+            predicted[name],
+            seconds,
         )
-        return best_guess.moves[-2]
+        if self.log is not None:
+            record = {
+                "guesses": len(guesses),
+                "candidates": len(words),
+                "strategy": name,
+                "predicted": predicted,
+                "seconds": seconds,
+                "budget": self.budget,
+            }
+            with open(self.log, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        return guess
+
+
+def sample_positions(
+    vocabulary: Vocabulary,
+    games: int,
+    seed: int | None = None,
+) -> list[Position]:
+    """Positions met playing greedily against random answers."""
+    rng = random.Random(seed)
+    greedy = BeamGuesser(vocabulary, depth=1, width=1)
+    answers = vocabulary.decode(vocabulary.answers)
+    opener = opening_guess(vocabulary)
+    positions: list[Position] = []
+    for aim in rng.sample(answers, min(games, len(answers))):
+        guesses, scores = [opener], [feedback(aim, opener)]
+        while scores[-1] != CORRECT_CODE and len(guesses) < 6:
+            positions.append((list(guesses), list(scores)))
+            guesses.append(greedy(guesses, scores))
+            scores.append(feedback(aim, guesses[-1]))
+    return positions
 
 
 class Wordle:
@@ -290,18 +895,19 @@ class Wordle:
         self,
         guesser: Guesser,
         scorer: Scorer,
-        vocabulary: list[str],
+        vocabulary: Vocabulary,
     ) -> None:
         self.guesser = guesser
         self.scorer = scorer
         self.vocabulary = vocabulary
         self.guess_next = True
         self.guesses: list[str] = []
-        self.scores: list[str] = []
+        self.scores: list[int] = []
 
     def __str__(self) -> str:
         string = "\n".join(
-            f"{guess} {score}" for guess, score in zip(self.guesses, self.scores)
+            f"{guess} {decode(score)}"
+            for guess, score in zip(self.guesses, self.scores)
         )
         if len(self.guesses) > len(self.scores):
             string += f"\n{self.guesses[-1]}"
@@ -312,7 +918,7 @@ class Wordle:
             raise RuntimeError("Score the last guess first.")
         self.guesses.append(guess)
 
-    def score(self) -> str:
+    def score(self) -> int:
         if len(self.scores) == len(self.guesses):
             raise RuntimeError("Make another guess first.")
         score = self.scorer(self.guesses[-1])
@@ -328,14 +934,14 @@ class Wordle:
         self.guess_next = not self.guess_next
 
     def is_terminal(self) -> bool:
-        correct_guess = any(s == CORRECT_GUESS for s in self.scores)
+        correct_guess = CORRECT_CODE in self.scores
         no_more_guesses = len(self.scores) == 6
         return correct_guess or no_more_guesses
 
 
 def main(
     truth: str,
-    vocabulary: list[str],
+    vocabulary: Vocabulary,
     guesser: Guesser,
     scorer: Scorer,
 ) -> int:
@@ -358,13 +964,13 @@ class WordleArgs:
     def __init__(
         self,
         truth: str,
-        vocabulary: list[str],
+        vocabulary: Vocabulary,
         guesser: Guesser,
         scorer: Scorer,
         log_level: str,
     ) -> None:
-        if truth not in vocabulary:
-            raise ValueError(f"Target '{truth}' not in vocabulary.")
+        if not vocabulary.is_answer(truth):
+            raise ValueError(f"Target '{truth}' not in answers.")
         self.truth = truth
         self.vocabulary = vocabulary
         self.guesser = guesser
@@ -377,14 +983,52 @@ class WordleArgs:
         vocab_path = (
             "words/words.txt" if args.vocabulary is None else args.vocabulary
         )
-        with open(vocab_path) as f:
-            vocabulary = [line.strip().lower() for line in f]
-        truth = random.choice(vocabulary) if args.truth is None else args.truth
-        guesser = (
-            UserGuesser(vocabulary=vocabulary)
-            if args.interactive_guess
-            else AlphaBetaGuesser(vocabulary)
-        )
+        vocabulary = Vocabulary.from_file(vocab_path, answers_path=args.answers)
+        answers = vocabulary.decode(vocabulary.answers)
+        truth = random.choice(answers) if args.truth is None else args.truth
+        guesser: Guesser
+        if args.interactive_guess:
+            guesser = UserGuesser(vocabulary=vocabulary)
+        elif args.guesser == "beam":
+            guesser = BeamGuesser(
+                vocabulary,
+                depth=args.depth,
+                width=args.width,
+                schedule=(
+                    None if args.sample is None else Schedule(sample=args.sample)
+                ),
+                seed=args.seed,
+            )
+        elif args.guesser == "dispatch":
+            if not os.path.exists(args.costs):
+                cli.error(
+                    f"no cost model at {args.costs}, write one with --calibrate"
+                )
+            guesser = DispatchGuesser(
+                vocabulary,
+                strategies(vocabulary),
+                CostModel.load(args.costs),
+                budget=args.budget,
+                log=args.dispatch_log,
+            )
+        elif args.guesser == "mcts":
+            guesser = MCTSGuesser(
+                vocabulary,
+                simulations=args.simulations,
+                seconds=args.seconds,
+                width=args.width,
+            )
+        elif args.guesser == "expectimax":
+            guesser = ExpectimaxGuesser(
+                vocabulary, depth=args.depth, width=args.width
+            )
+        else:
+            guesser = AlphaBetaGuesser(
+                vocabulary,
+                cache=None if args.cache is None else SolvedCache(args.cache),
+            )
+        if args.ponder and not args.interactive_guess:
+            guesser = PonderingGuesser(guesser, vocabulary)
         scorer = UserScorer() if args.interactive_score else AutoScorer(truth=truth)
         return WordleArgs(
             truth=truth,
@@ -397,13 +1041,63 @@ class WordleArgs:
 
 cli = argparse.ArgumentParser()
 cli.add_argument("--truth")
-cli.add_argument("--vocabulary")
+cli.add_argument("--vocabulary", help="Allowed guesses.")
+cli.add_argument("--answers", help="Possible answers, the vocabulary if not given.")
 cli.add_argument("--log-level", default="WARNING")
+cli.add_argument("--cache", help="SQLite file of solved positions to share.")
+cli.add_argument(
+    "--guesser",
+    choices=["alphabeta", "beam", "dispatch", "expectimax", "mcts"],
+    default="alphabeta",
+)
+cli.add_argument("--depth", type=int, default=2, help="Guesses to look ahead.")
+cli.add_argument("--width", type=int, default=10, help="Guesses searched per turn.")
+cli.add_argument("--simulations", type=int, default=1000, help="MCTS playouts.")
+cli.add_argument("--seconds", type=float, help="MCTS time budget per guess.")
+cli.add_argument(
+    "--sample", type=int, help="Beam guesses are narrowed on samples of this size."
+)
+cli.add_argument("--seed", type=int)
+cli.add_argument("--costs", default="costs.json", help="Cost model to dispatch by.")
+cli.add_argument("--budget", type=float, default=1.0, help="Seconds per guess.")
+cli.add_argument("--dispatch-log", help="JSONL file to log dispatch choices to.")
+cli.add_argument(
+    "--calibrate",
+    action="store_true",
+    help="Time the dispatch strategies on --games games and write --costs.",
+)
+cli.add_argument("--games", type=int, default=20)
 cli.add_argument("--interactive-guess", action="store_true")
 cli.add_argument("--interactive-score", action="store_true")
+cli.add_argument(
+    "--ponder", action="store_true", help="Guess ahead while scores are entered."
+)
+
+
+def calibrate_strategies(
+    vocabulary: Vocabulary,
+    path: str,
+    games: int,
+    seed: int | None = None,
+) -> CostModel:
+    positions = sample_positions(vocabulary, games, seed=seed)
+    model = calibrate(vocabulary, strategies(vocabulary), positions)
+    model.save(path)
+    return model
 
 
 if __name__ == "__main__":
+    if (options := cli.parse_args()).calibrate:
+        logging.basicConfig(level=options.log_level.upper())
+        calibrate_strategies(
+            Vocabulary.from_file(
+                options.vocabulary or "words/words.txt", answers_path=options.answers
+            ),
+            options.costs,
+            options.games,
+            seed=options.seed,
+        )
+        raise SystemExit
     print("=== PyWordle ===")
     args = WordleArgs.from_argument_parser(cli)
     logging.basicConfig(level=args.log_level)
@@ -1,4 +1,6 @@
 from search.alphabeta import alphabeta
+from search.expectimax import expectimax, expectimax_move
+from search.mcts import mcts
 from search.minimax import minimax
 
-__all__ = ["alphabeta", "minimax"]
+__all__ = ["alphabeta", "expectimax", "expectimax_move", "mcts", "minimax"]
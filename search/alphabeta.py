@@ -1,12 +1,36 @@
 import logging
+from typing import Any
 
 from search.node import Node
 
-
 logger = logging.getLogger(__name__)
 
 
-def alphabeta(node: Node, a: Node, b: Node, soft: bool = True) -> Node:
+# Results of searched nodes, keyed by their moves: the best node found and
+# the window searched with.
+Table = dict[tuple[Any, ...], tuple[Node, Node, Node]]
+
+
+def _reusable(best: Node, a0: Node, b0: Node, a: Node, b: Node) -> bool:
+    # inside its window a result is exact, outside it is a bound,
+    # which still holds within any narrower window
+    exact = a0 < best < b0
+    return exact or (a0 <= a and b <= b0)
+
+
+def alphabeta(
+    node: Node,
+    a: Node,
+    b: Node,
+    soft: bool = True,
+    table: Table | None = None,
+) -> Node:
+    """Best node reachable from ``node`` within the window ``a`` to ``b``.
+
+    ``table`` keeps results between searches, so a later search of a
+    subtree, say after the opponent's move, starts from the earlier one.
+
+    """
     logger.debug("got node=%s a=%s b=%s", node.moves, a.moves, b.moves)
     if node.is_maximising():
         logger.debug("got node=%s a=%s b=%s", node.score(), a.score(), b.score())
@@ -15,6 +39,13 @@ def alphabeta(node: Node, a: Node, b: Node, soft: bool = True) -> Node:
         logger.debug("returned node=%s a=%s b=%s", node.moves, a.moves, b.moves)
         return node
 
+    if table is not None:
+        key = tuple(node.moves)
+        if (entry := table.get(key)) is not None and _reusable(*entry, a, b):
+            logger.debug("reused node=%s", node.moves)
+            return entry[0]
+        window = a, b
+
     gt_op = "__ge__" if soft else "__gt__"
     lt_op = "__le__" if soft else "__lt__"
 
@@ -22,16 +53,22 @@ def alphabeta(node: Node, a: Node, b: Node, soft: bool = True) -> Node:
 
     for child in node.children():
         if node.is_maximising():
-            best_node = max(best_node, alphabeta(node=child, a=a, b=b, soft=soft))
+            best_node = max(
+                best_node, alphabeta(node=child, a=a, b=b, soft=soft, table=table)
+            )
             a = max(a, best_node)
             if getattr(best_node, gt_op)(b):
                 break
         else:
-            best_node = min(best_node, alphabeta(node=child, a=a, b=b, soft=soft))
+            best_node = min(
+                best_node, alphabeta(node=child, a=a, b=b, soft=soft, table=table)
+            )
             b = min(b, best_node)
             if getattr(best_node, lt_op)(a):
                 break
 
     logger.debug("returned node=%s a=%s b=%s", node.moves, a.moves, b.moves)
 
+    if table is not None:
+        table[key] = (best_node, *window)
     return best_node
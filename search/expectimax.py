@@ -0,0 +1,122 @@
+"""Expectimax with Star1 and Star2 pruning.
+
+Pruning relies on every utility lying within ``[lower, upper]``.
+Chance node values are probability weighted sums, so once the outcomes
+searched so far, together with the bounds for the ones left, put the value
+outside the window the rest are skipped (Star1). Before that, when outcomes
+are maximising nodes, one child of each is probed for cheap lower bounds
+(Star2).
+"""
+
+import logging
+import math
+from typing import TypeVar
+
+from search.node import ChanceNode
+
+logger = logging.getLogger(__name__)
+
+
+N = TypeVar("N", bound=ChanceNode)
+
+
+def expectimax(
+    node: ChanceNode,
+    depth: int,
+    lower: float,
+    upper: float,
+    a: float = -math.inf,
+    b: float = math.inf,
+) -> float:
+    """Value of ``node`` searching ``depth`` plies.
+
+    Values outside the window ``(a, b)`` are only bounds: a returned value
+    ``<= a`` is an upper bound and ``>= b`` a lower bound.
+
+    """
+    if depth == 0 or node.is_terminal():
+        return node.utility()
+    if node.is_chance():
+        return _chance(node, depth, lower, upper, a, b)
+
+    if node.is_maximising():
+        best = -math.inf
+        for child in node.children():
+            best = max(best, expectimax(child, depth - 1, lower, upper, a, b))
+            a = max(a, best)
+            if best >= b:
+                break
+    else:
+        best = math.inf
+        for child in node.children():
+            best = min(best, expectimax(child, depth - 1, lower, upper, a, b))
+            b = min(b, best)
+            if best <= a:
+                break
+    return best
+
+
+def _chance(
+    node: ChanceNode,
+    depth: int,
+    lower: float,
+    upper: float,
+    a: float,
+    b: float,
+) -> float:
+    outcomes = list(node.outcomes())
+    lowers = [lower] * len(outcomes)
+
+    # Star2: the value of any child of a maximising node is a lower bound
+    if depth > 1:
+        bound = lower
+        for i, (p, child) in enumerate(outcomes):
+            if child.is_terminal() or not child.is_maximising():
+                continue
+            probe = next(iter(child.children()), None)
+            if probe is None:
+                continue
+            lowers[i] = expectimax(probe, depth - 2, lower, upper, lowers[i], upper)
+            bound = sum(p_ * lo for (p_, _), lo in zip(outcomes, lowers))
+            if bound >= b:
+                logger.debug("star2 cut %s >= %s", bound, b)
+                return bound
+
+    # Star1
+    value = 0.0
+    rest_lower = sum(p * lo for (p, _), lo in zip(outcomes, lowers))
+    rest_upper = sum(p for p, _ in outcomes) * upper
+    for i, (p, child) in enumerate(outcomes):
+        rest_lower -= p * lowers[i]
+        rest_upper -= p * upper
+        # searched in the very window cut against, a bound the child returns
+        # is never mistaken for its value, as it could be in a narrower one
+        child_a = (a - value - rest_upper) / p
+        child_b = (b - value - rest_lower) / p
+        v = expectimax(child, depth - 1, lower, upper, child_a, child_b)
+        value += p * v
+        if v <= child_a:
+            logger.debug("star1 fail low")
+            return value + rest_upper
+        if v >= child_b:
+            logger.debug("star1 fail high")
+            return value + rest_lower
+    return value
+
+
+def expectimax_move(
+    node: N,
+    depth: int,
+    lower: float,
+    upper: float,
+) -> N:
+    """Best child of a maximising ``node``."""
+    best_value = -math.inf
+    best_child = None
+    for child in node.children():
+        value = expectimax(child, depth - 1, lower, upper, a=best_value)
+        if best_child is None or value > best_value:
+            best_value, best_child = value, child
+    if best_child is None:
+        raise ValueError("Node has no children.")
+    return best_child
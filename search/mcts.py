@@ -0,0 +1,192 @@
+"""Monte Carlo tree search.
+
+UCT selection with progressive widening: a node visited ``n`` times may
+expand ``ceil(widening * n ** alpha)`` children, taken in the order
+``children()`` yields them, so nodes should yield their most promising
+children first. Chance nodes (see ``search.node.ChanceNode``) are sampled
+by probability. Rollouts follow a policy, by default the first child,
+which is greedy for nodes ordering children by a prior.
+"""
+
+from __future__ import annotations
+import logging
+import math
+import random
+import time
+from typing import Any, Callable, Iterator
+
+from search.node import Node
+
+logger = logging.getLogger(__name__)
+
+
+def first_child(node: Any, rng: random.Random) -> Any:
+    return next(iter(node.children()), None)
+
+
+def random_child(node: Any, rng: random.Random) -> Any:
+    children = list(node.children())
+    return rng.choice(children) if children else None
+
+
+def _is_chance(node: Any) -> bool:
+    return bool(getattr(node, "is_chance", lambda: False)())
+
+
+def _sample(node: Any, rng: random.Random) -> Any:
+    outcomes = list(node.outcomes())
+    (child,) = rng.choices(
+        [c for _, c in outcomes], weights=[p for p, _ in outcomes]
+    )
+    return child
+
+
+class _Tree:
+    """Search statistics of a node."""
+
+    def __init__(self, node: Any, parent: _Tree | None = None) -> None:
+        self.node = node
+        self.parent = parent
+        self.children: list[_Tree] = []
+        self.outcomes: dict[tuple[Any, ...], _Tree] = {}
+        self._unexpanded: Iterator[Any] | None = None
+        self.exhausted = False
+        self.visits = 0
+        self.total = 0.0
+
+    def mean(self) -> float:
+        return self.total / self.visits if self.visits else 0.0
+
+    def expand(self, limit: int) -> _Tree | None:
+        """A new child if fewer than ``limit`` have been expanded."""
+        if self.exhausted or len(self.children) >= limit:
+            return None
+        if self._unexpanded is None:
+            self._unexpanded = iter(self.node.children())
+        child = next(self._unexpanded, None)
+        if child is None:
+            self.exhausted = True
+            return None
+        tree = _Tree(child, parent=self)
+        self.children.append(tree)
+        return tree
+
+
+class MCTS:
+    """Monte Carlo tree search from ``node``.
+
+    ``value`` scores the node a rollout ends on, from the maximising player's
+    point of view; ``exploration`` should be on the scale of those values.
+
+    """
+
+    def __init__(
+        self,
+        node: Node,
+        value: Callable[[Any], float] = lambda n: n.score(),
+        policy: Callable[[Any, random.Random], Any] = first_child,
+        exploration: float = math.sqrt(2),
+        widening: float = 1.0,
+        alpha: float = 0.5,
+        max_rollout: int = 100,
+        seed: int | None = None,
+    ) -> None:
+        self.root = _Tree(node)
+        self.value = value
+        self.policy = policy
+        self.exploration = exploration
+        self.widening = widening
+        self.alpha = alpha
+        self.max_rollout = max_rollout
+        self.rng = random.Random(seed)
+
+    def search(
+        self,
+        simulations: int | None = None,
+        seconds: float | None = None,
+    ) -> Node:
+        """Run until either budget is spent, return the most visited child."""
+        if simulations is None and seconds is None:
+            raise ValueError("Give a number of simulations or seconds.")
+        deadline = None if seconds is None else time.monotonic() + seconds
+        done = 0
+        while simulations is None or done < simulations:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            self.simulate()
+            done += 1
+        logger.info("simulations=%s root visits=%s", done, self.root.visits)
+        return self.best()
+
+    def best(self) -> Node:
+        if not self.root.children:
+            raise ValueError("Root not expanded, search first.")
+        best: Node = max(self.root.children, key=lambda t: t.visits).node
+        return best
+
+    def simulate(self) -> None:
+        tree: _Tree | None = self.select()
+        assert tree is not None
+        reward = self.rollout(tree.node)
+        while tree is not None:
+            tree.visits += 1
+            tree.total += reward
+            tree = tree.parent
+
+    def select(self) -> _Tree:
+        tree = self.root
+        while not tree.node.is_terminal():
+            if _is_chance(tree.node):
+                tree = self.outcome(tree)
+                continue
+            limit = math.ceil(self.widening * max(tree.visits, 1) ** self.alpha)
+            if (child := tree.expand(limit)) is not None:
+                return child
+            if not tree.children:
+                return tree
+            tree = self.uct(tree)
+        return tree
+
+    def outcome(self, tree: _Tree) -> _Tree:
+        child = _sample(tree.node, self.rng)
+        # outcomes are new objects each time, key them by their moves
+        key = tuple(child.moves)
+        if key not in tree.outcomes:
+            tree.outcomes[key] = _Tree(child, parent=tree)
+            tree.children.append(tree.outcomes[key])
+        return tree.outcomes[key]
+
+    def uct(self, tree: _Tree) -> _Tree:
+        sign = 1 if tree.node.is_maximising() else -1
+        log_visits = math.log(tree.visits)
+
+        def bound(child: _Tree) -> float:
+            if not child.visits:
+                return math.inf
+            explore = math.sqrt(log_visits / child.visits)
+            return sign * child.mean() + self.exploration * explore
+
+        return max(tree.children, key=bound)
+
+    def rollout(self, node: Any) -> float:
+        for _ in range(self.max_rollout):
+            if node.is_terminal():
+                break
+            if _is_chance(node):
+                child = _sample(node, self.rng)
+            else:
+                child = self.policy(node, self.rng)
+            if child is None:
+                break
+            node = child
+        return self.value(node)
+
+
+def mcts(
+    node: Node,
+    simulations: int | None = None,
+    seconds: float | None = None,
+    **kwargs: Any,
+) -> Node:
+    """Best child of ``node`` after a search, see ``MCTS`` for the options."""
+    return MCTS(node, **kwargs).search(simulations=simulations, seconds=seconds)
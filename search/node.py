@@ -6,32 +6,41 @@ class Node(Protocol):
 
     moves: list[Any]
 
-    def __gt__(self, other: Self) -> bool:
-        ...
+    def __gt__(self, other: Self) -> bool: ...
 
-    def __lt__(self, other: Self) -> bool:
-        ...
+    def __lt__(self, other: Self) -> bool: ...
 
-    def __ge__(self, other: Self) -> bool:
-        ...
+    def __ge__(self, other: Self) -> bool: ...
 
-    def __le__(self, other: Self) -> bool:
-        ...
+    def __le__(self, other: Self) -> bool: ...
 
-    def score(self) -> int:
-        ...
+    def score(self) -> int: ...
 
-    def is_terminal(self) -> bool:
-        ...
+    def is_terminal(self) -> bool: ...
 
-    def children(self) -> Iterator[Self]:
-        ...
+    def children(self) -> Iterator[Self]: ...
 
-    def is_maximising(self) -> bool:
-        ...
+    def is_maximising(self) -> bool: ...
+
+    def minimum(self) -> Self: ...
+
+    def maximum(self) -> Self: ...
+
+
+class ChanceNode(Node, Protocol):
+    """Node that may also be a chance node, for expectimax.
+
+    Values are expected utilities, so utility is a float kept apart from the
+    comparison based score used by minimax and alpha-beta.
+
+    """
+
+    def is_chance(self) -> bool: ...
 
-    def minimum(self) -> Self:
+    def outcomes(self) -> Iterator[tuple[float, Self]]:
+        """Children of a chance node with their probabilities."""
         ...
 
-    def maximum(self) -> Self:
+    def utility(self) -> float:
+        """Value of a terminal node, or an estimate at the search horizon."""
         ...
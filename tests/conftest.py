@@ -0,0 +1,50 @@
+import pytest
+
+from new_wordle import Guesser
+from wordle.evaluate import CORRECT_CODE, feedback
+from wordle.models import Vocabulary
+
+WORDS = [
+    "abbot",
+    "scorn",
+    "today",
+    "rider",
+    "dizzy",
+    "crime",
+    "rakes",
+    "clear",
+    "leech",
+    "burnt",
+    "monic",
+    "motto",
+    "noose",
+    "maxim",
+    "crate",
+]
+
+
+@pytest.fixture
+def words() -> list[str]:
+    """A few words, enough for guessers to play whole games quickly."""
+    return list(WORDS)
+
+
+@pytest.fixture
+def vocabulary(words: list[str]) -> Vocabulary:
+    return Vocabulary(words)
+
+
+@pytest.fixture(params=WORDS)
+def aim(request: pytest.FixtureRequest) -> str:
+    """Each of the words in turn, to play a game against."""
+    return str(request.param)
+
+
+def play(guesser: Guesser, aim: str) -> list[str]:
+    """The guesses ``guesser`` makes to find ``aim``."""
+    guesses: list[str] = []
+    scores: list[int] = []
+    while not scores or scores[-1] != CORRECT_CODE:
+        guesses.append(guesser(guesses, scores))
+        scores.append(feedback(aim, guesses[-1]))
+    return guesses
@@ -0,0 +1,109 @@
+from __future__ import annotations
+import random
+from typing import Iterator
+
+import pytest
+
+from conftest import play
+from new_wordle import AlphaBetaGuesser
+from search.alphabeta import Table, alphabeta
+from wordle.models import Vocabulary
+
+
+class Tree:
+    """Random game tree alternating max and min layers."""
+
+    def __init__(
+        self,
+        seed: int,
+        depth: int = 0,
+        moves: list[int] | None = None,
+        fixed: int | None = None,
+    ):
+        self.seed = seed
+        self.depth = depth
+        self.moves = [] if moves is None else moves
+        self.fixed = fixed
+
+    def is_maximising(self) -> bool:
+        return not self.depth % 2
+
+    def is_terminal(self) -> bool:
+        return self.depth == 6
+
+    def score(self) -> int:
+        if self.fixed is not None:
+            return self.fixed
+        return random.Random(self.seed).randint(-10, 10)
+
+    def children(self) -> Iterator[Tree]:
+        for i in range(3):
+            yield Tree(self.seed * 7 + i + 1, self.depth + 1, self.moves + [i])
+
+    def __lt__(self, other: Tree) -> bool:
+        return self.score() < other.score()
+
+    def __le__(self, other: Tree) -> bool:
+        return self.score() <= other.score()
+
+    def __gt__(self, other: Tree) -> bool:
+        return self.score() > other.score()
+
+    def __ge__(self, other: Tree) -> bool:
+        return self.score() >= other.score()
+
+    def minimum(self) -> Tree:
+        return Tree(0, fixed=-100)
+
+    def maximum(self) -> Tree:
+        return Tree(0, fixed=100)
+
+
+@pytest.mark.parametrize("seed", range(1, 11))
+def test_table_keeps_value(seed: int) -> None:
+    tree = Tree(seed)
+    a, b = tree.minimum(), tree.maximum()
+    table: Table = {}
+    expected = alphabeta(tree, a=a, b=b).score()
+    assert alphabeta(tree, a=a, b=b, table=table).score() == expected
+    assert table
+    # searching again, and searching a subtree, reuse the results
+    assert alphabeta(tree, a=a, b=b, table=table).score() == expected
+    for child in tree.children():
+        fresh = alphabeta(child, a=a, b=b).score()
+        assert alphabeta(child, a=a, b=b, table=table).score() == fresh
+
+
+def promotions(reused: AlphaBetaGuesser, aim: str) -> int:
+    """Play ``aim``, checking guesses against a fresh search, count promotions."""
+    vocabulary = reused.vocabulary
+    fresh = AlphaBetaGuesser(vocabulary)
+    promoted = 0
+
+    def checked(guesses: list[str], scores: list[int]) -> str:
+        nonlocal promoted
+        # the node the last search reached for this position, if any
+        searched = None
+        if reused.root is not None:
+            played = reused.root.child(vocabulary.id(guesses[-1]))
+            searched = None if played is None else played.child(scores[-1])
+        guess = reused(guesses, scores)
+        if searched is not None:
+            assert reused.root is searched
+            promoted += 1
+        fresh.root = None
+        assert fresh(guesses, scores) == guess
+        if reused.root is not None:
+            prefix = tuple(reused.root.moves)
+            assert all(k[: len(prefix)] == prefix for k in reused.table)
+        return guess
+
+    assert len(play(checked, aim)) <= 6
+    return promoted
+
+
+def test_guesser_reuses_tree(vocabulary: Vocabulary) -> None:
+    answers = vocabulary.decode(vocabulary.answers)
+    promoted = [promotions(AlphaBetaGuesser(vocabulary), aim) for aim in answers]
+    # most games are won before a searched position comes up again
+    assert sum(promoted) > 0
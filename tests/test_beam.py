@@ -0,0 +1,37 @@
+import pytest
+
+from conftest import play
+from new_wordle import BeamGuesser, best_guesses
+from wordle.evaluate import CORRECT_CODE
+from wordle.models import Vocabulary
+
+
+@pytest.mark.parametrize("depth,width", [(1, 1), (2, 3), (3, 5)])
+def test_finds_aim(vocabulary: Vocabulary, aim: str, depth: int, width: int) -> None:
+    guesser = BeamGuesser(vocabulary, depth=depth, width=width)
+    assert len(play(guesser, aim)) <= 4
+
+
+def test_width_one_is_greedy(vocabulary: Vocabulary) -> None:
+    words = vocabulary.all()
+    guesser = BeamGuesser(vocabulary, depth=3, width=1)
+    _, guess = guesser.value(words, depth=3)
+    assert guess == best_guesses(vocabulary, words, words, 1)[0]
+
+
+def test_wider_beam_is_no_worse(vocabulary: Vocabulary) -> None:
+    words = vocabulary.all()
+    narrow, _ = BeamGuesser(vocabulary, depth=2, width=1).value(words, depth=2)
+    wide, _ = BeamGuesser(vocabulary, depth=2, width=len(words)).value(
+        words, depth=2
+    )
+    assert wide <= narrow
+
+
+def test_needs_a_possible_answer(vocabulary: Vocabulary) -> None:
+    guesser = BeamGuesser(vocabulary)
+    with pytest.raises(ValueError):
+        guesser.value(vocabulary.encode([]), depth=2)
+    # no answer is both unlike and equal to the opener
+    with pytest.raises(ValueError):
+        guesser(["crate", "crate"], [0, CORRECT_CODE])
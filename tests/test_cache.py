@@ -0,0 +1,70 @@
+import multiprocessing
+import threading
+from pathlib import Path
+
+from wordle.cache import SolvedCache, position_key
+from wordle.models import Vocabulary
+from wordle.wordle import wordle
+
+
+def test_position_key_is_canonical(words: list[str]) -> None:
+    one = Vocabulary(words)
+    other = Vocabulary(reversed(words))
+    position = ["today", "crate"]
+    assert position_key(one, one.encode(position)) == position_key(
+        other, other.encode(reversed(position))
+    )
+    assert position_key(one, one.encode(position)) != position_key(
+        one, one.encode(position), guesses=one.all()
+    )
+
+
+def test_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = SolvedCache(str(tmp_path / "solved.sqlite"), max_entries=10)
+    for i in range(10):
+        cache.put(f"key{i}", depth=1, guess="crate", value=i)
+    assert cache.get("key0", depth=1) == ("crate", 0)
+    cache.put("key10", depth=1, guess="crate", value=10)
+    assert len(cache) == 9
+    assert cache.get("key0", depth=1) is not None
+    assert cache.get("key1", depth=1) is None
+
+
+def _put_many(path: str, worker: int) -> None:
+    cache = SolvedCache(path)
+    for i in range(50):
+        cache.put(f"{worker}-{i}", depth=2, guess="crate", value=i)
+
+
+def test_concurrent_writers(tmp_path: Path) -> None:
+    path = str(tmp_path / "solved.sqlite")
+    processes = [
+        multiprocessing.Process(target=_put_many, args=(path, worker))
+        for worker in range(4)
+    ]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+    assert len(SolvedCache(path)) == 200
+
+
+def test_wordle_with_cache_plays_the_same(tmp_path: Path, words: list[str]) -> None:
+    cache = SolvedCache(str(tmp_path / "solved.sqlite"))
+    cold = [wordle(words, aim, "crate", soft=True, cache=cache) for aim in words]
+    assert len(cache)
+    warm = [wordle(words, aim, "crate", soft=True, cache=cache) for aim in words]
+    plain = [wordle(words, aim, "crate", soft=True) for aim in words]
+    assert (
+        [str(b) for b in cold] == [str(b) for b in warm] == [str(b) for b in plain]
+    )
+
+
+def test_shared_between_threads(tmp_path: Path) -> None:
+    cache = SolvedCache(str(tmp_path / "solved.sqlite"))
+    cache.put("key", depth=1, guess="crate", value=1)
+    got = []
+    thread = threading.Thread(target=lambda: got.append(cache.get("key", depth=1)))
+    thread.start()
+    thread.join()
+    assert got == [("crate", 1)]
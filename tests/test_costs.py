@@ -0,0 +1,105 @@
+import json
+import math
+import time
+from pathlib import Path
+
+import pytest
+
+from new_wordle import BeamGuesser, DispatchGuesser, Guesser, sample_positions
+from wordle.costs import CostModel, calibrate, features, fit
+from wordle.evaluate import CORRECT_CODE, feedback
+from wordle.models import Vocabulary
+
+
+@pytest.mark.parametrize("coefficients", [[-5.0, 1.0, 0.0], [-3.0, 2.0, -0.5]])
+def test_fit_recovers_coefficients(coefficients: list[float]) -> None:
+    xs = [features(n, g) for n in [2, 10, 50, 300] for g in [1, 2, 3]]
+    ys = [sum(c * x for c, x in zip(coefficients, row)) for row in xs]
+    assert fit(xs, ys) == pytest.approx(coefficients, abs=1e-4)
+
+
+def test_model_round_trip(tmp_path: Path) -> None:
+    model = CostModel({"beam": [math.log(0.001), 1.0, 0.0]}, words=1000)
+    model.save(str(tmp_path / "costs.json"))
+    loaded = CostModel.load(str(tmp_path / "costs.json"))
+    assert "beam" in loaded and "mcts" not in loaded
+    assert loaded.words == 1000
+    assert loaded.predict("beam", 100, 1) == pytest.approx(0.1)
+    assert loaded.predict("beam", 100, 1, words=500) == pytest.approx(0.05)
+
+
+def test_calibrate(vocabulary: Vocabulary) -> None:
+    positions = sample_positions(vocabulary, games=5, seed=0)
+    assert positions
+    model = calibrate(
+        vocabulary,
+        {"beam": BeamGuesser(vocabulary, depth=1, width=2)},
+        positions,
+        shortcut=0.0,
+    )
+    assert "beam" in model
+    assert model.words == len(vocabulary)
+    assert model.predict("beam", len(vocabulary), 1) > 0
+
+
+class Slow:
+    def __call__(self, guesses: list[str], scores: list[int]) -> str:
+        time.sleep(60)
+        return guesses[0]
+
+
+def test_calibrate_stops_at_the_limit(vocabulary: Vocabulary) -> None:
+    positions = sample_positions(vocabulary, games=5, seed=0)
+    start = time.perf_counter()
+    model = calibrate(vocabulary, {"slow": Slow()}, positions, limit=0.1)
+    assert time.perf_counter() - start < 10
+    # stopped on the smallest position, counted as taking the limit
+    assert model.predict("slow", 1, 1) == pytest.approx(0.1, rel=0.1)
+
+
+class Fixed:
+    def __init__(self, guess: str) -> None:
+        self.guess = guess
+
+    def __call__(self, guesses: list[str], scores: list[int]) -> str:
+        return self.guess
+
+
+@pytest.mark.parametrize(
+    "budget,strategy",
+    [(10.0, "slow"), (0.5, "fast"), (0.001, "fast")],
+)
+def test_dispatch_by_budget(
+    vocabulary: Vocabulary, budget: float, strategy: str, tmp_path: Path
+) -> None:
+    strategies: dict[str, Guesser] = {"slow": Fixed("abbot"), "fast": Fixed("scorn")}
+    model = CostModel({"slow": [0.0, 0.0, 0.0], "fast": [-5.0, 0.0, 0.0]})
+    log = tmp_path / "dispatch.jsonl"
+    guesser = DispatchGuesser(vocabulary, strategies, model, budget, log=str(log))
+    guess = guesser(["crate"], [feedback("motto", "crate")])
+    assert guess == {"slow": "abbot", "fast": "scorn"}[strategy]
+    (record,) = [json.loads(line) for line in log.read_text().splitlines()]
+    assert record["strategy"] == strategy
+    assert record["candidates"] > 0
+
+
+def test_dispatch_needs_modelled_strategies(vocabulary: Vocabulary) -> None:
+    with pytest.raises(ValueError):
+        DispatchGuesser(vocabulary, {"slow": Fixed("abbot")}, CostModel({}))
+
+
+def test_dispatch_needs_a_possible_answer(vocabulary: Vocabulary) -> None:
+    model = CostModel({"slow": [0.0, 0.0, 0.0]})
+    guesser = DispatchGuesser(vocabulary, {"slow": Fixed("abbot")}, model)
+    # no answer is both unlike and equal to the opener
+    with pytest.raises(ValueError, match="No answer"):
+        guesser(["crate", "crate"], [0, CORRECT_CODE])
+
+
+def test_dispatch_scales_costs_by_vocabulary(vocabulary: Vocabulary) -> None:
+    strategies: dict[str, Guesser] = {"slow": Fixed("abbot"), "fast": Fixed("scorn")}
+    coefficients = {"slow": [0.0, 0.0, 0.0], "fast": [-5.0, 0.0, 0.0]}
+    # calibrated on a vocabulary a hundred times larger, slow is quick here
+    model = CostModel(coefficients, words=100 * len(vocabulary))
+    guesser = DispatchGuesser(vocabulary, strategies, model, budget=0.5)
+    assert guesser(["crate"], [feedback("motto", "crate")]) == "abbot"
@@ -0,0 +1,165 @@
+import multiprocessing
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+from multiprocessing.process import BaseProcess
+from multiprocessing.synchronize import Event
+from pathlib import Path
+
+import pytest
+
+from wordle.distributed import Coordinator, Job, work
+from wordle.models import Vocabulary
+from wordle.solver import prove
+
+# forked workers would inherit the coordinator's listening socket
+SPAWN = multiprocessing.get_context("spawn")
+
+
+def coordinator(
+    vocabulary: Vocabulary,
+    depth: int,
+    split: int = 1,
+    checkpoint: str | None = None,
+    job_timeout: float | None = None,
+) -> Coordinator:
+    return Coordinator(
+        vocabulary,
+        start=vocabulary.id("crate"),
+        candidates=vocabulary.answers,
+        guesses=vocabulary.all(),
+        depth=depth,
+        split=split,
+        checkpoint=checkpoint,
+        job_timeout=job_timeout,
+    )
+
+
+def start_workers(c: Coordinator, n: int) -> list[BaseProcess]:
+    workers: list[BaseProcess] = [
+        SPAWN.Process(target=work, args=(c.address, c.authkey)) for _ in range(n)
+    ]
+    for w in workers:
+        w.start()
+    return workers
+
+
+def die_after_one_job(address: tuple[str, int], authkey: bytes) -> None:
+    with Client(address, authkey=authkey) as conn:
+        conn.recv()
+        conn.recv()
+
+
+def hang_on_one_job(
+    address: tuple[str, int], authkey: bytes, started: Event
+) -> None:
+    with Client(address, authkey=authkey) as conn:
+        conn.recv()
+        conn.recv()
+        started.set()
+        time.sleep(60)
+
+
+@pytest.mark.parametrize("depth", [2, 3, 4])
+@pytest.mark.parametrize("split", [1, 2, 3])
+def test_agrees_with_prove(vocabulary: Vocabulary, depth: int, split: int) -> None:
+    expected, _ = prove(
+        vocabulary, vocabulary.id("crate"), vocabulary.all(), vocabulary.all(), depth
+    )
+    c = coordinator(vocabulary, depth, split)
+    workers = start_workers(c, 3)
+    got = c.run()
+    for w in workers:
+        w.join(timeout=10)
+        assert w.exitcode == 0
+    if expected is None:
+        assert got is None
+    else:
+        assert got is not None
+        assert got.depth() <= depth
+        assert got.guess == vocabulary.id("crate")
+
+
+def test_requeues_jobs_of_dead_workers(vocabulary: Vocabulary) -> None:
+    c = coordinator(vocabulary, depth=4)
+    dying = SPAWN.Process(target=die_after_one_job, args=(c.address, c.authkey))
+    dying.start()
+
+    def replace() -> None:
+        dying.join()
+        start_workers(c, 1)
+
+    # the dying worker is alone, so takes a job
+    threading.Thread(target=replace).start()
+    got = c.run()
+    assert dying.exitcode == 0
+    assert got is not None
+    assert got.depth() <= 4
+
+
+def test_requeues_jobs_of_hung_workers(vocabulary: Vocabulary) -> None:
+    c = coordinator(vocabulary, depth=4, job_timeout=0.5)
+    started = SPAWN.Event()
+    hanging = SPAWN.Process(
+        target=hang_on_one_job, args=(c.address, c.authkey, started)
+    )
+    hanging.start()
+
+    def replace() -> None:
+        started.wait()
+        start_workers(c, 1)
+
+    threading.Thread(target=replace).start()
+    got = c.run()
+    hanging.terminate()
+    assert got is not None
+    assert got.depth() <= 4
+
+
+def test_needs_authkey_beyond_loopback(vocabulary: Vocabulary) -> None:
+    with pytest.raises(ValueError):
+        Coordinator(
+            vocabulary,
+            start=vocabulary.id("crate"),
+            candidates=vocabulary.answers,
+            guesses=vocabulary.all(),
+            depth=2,
+            address=("0.0.0.0", 0),
+        )
+
+
+def test_worker_stops_on_wrong_authkey(caplog: pytest.LogCaptureFixture) -> None:
+    with Listener(("localhost", 0), authkey=b"right") as listener:
+
+        def accept() -> None:
+            with pytest.raises(multiprocessing.AuthenticationError):
+                listener.accept()
+
+        accepting = threading.Thread(target=accept)
+        accepting.start()
+        work(listener.address, b"wrong")
+        accepting.join()
+    assert "authkey rejected" in caplog.text
+
+
+def test_job_key_depends_on_guesses(vocabulary: Vocabulary) -> None:
+    candidates = vocabulary.encode(["abbot", "today"])
+    keys = {
+        Job(vocabulary, candidates, vocabulary.all(), depth=2).key,
+        Job(vocabulary, candidates, candidates, depth=2).key,
+        Job(vocabulary, candidates, candidates, depth=3).key,
+    }
+    assert len(keys) == 3
+
+
+def test_resumes_from_checkpoint(vocabulary: Vocabulary, tmp_path: Path) -> None:
+    checkpoint = str(tmp_path / "jobs.jsonl")
+    c = coordinator(vocabulary, depth=4, checkpoint=checkpoint)
+    start_workers(c, 2)
+    first = c.run()
+    assert first is not None
+
+    # every job is checkpointed, so no worker is needed
+    again = coordinator(vocabulary, depth=4, checkpoint=checkpoint).run()
+    assert again is not None
+    assert again.format(vocabulary) == first.format(vocabulary)
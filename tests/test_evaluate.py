@@ -1,6 +1,6 @@
 import pytest
 
-from wordle.evaluate import evaluate, _score
+from wordle.evaluate import encode, evaluate, _score
 
 
 @pytest.mark.parametrize(
@@ -27,5 +27,5 @@ def test_evaluate(aim: str, guess: str, expected: str) -> None:
     ),
 )
 def test_score(status: str, expected: int) -> None:
-    got = _score(status)
+    got = _score(encode(status))
     assert got == expected
@@ -0,0 +1,86 @@
+from __future__ import annotations
+import random
+from typing import Iterator
+
+import pytest
+
+from search.expectimax import expectimax, expectimax_move
+
+
+class Tree:
+    """Random game tree alternating max, chance and min layers."""
+
+    def __init__(self, seed: int, depth: int = 0, moves: list[int] | None = None):
+        self.seed = seed
+        self.depth = depth
+        self.moves = [] if moves is None else moves
+
+    def kind(self) -> str:
+        return ["max", "chance", "min", "chance"][self.depth % 4]
+
+    def is_maximising(self) -> bool:
+        return self.kind() == "max"
+
+    def is_chance(self) -> bool:
+        return self.kind() == "chance"
+
+    def is_terminal(self) -> bool:
+        return self.depth == 5
+
+    def utility(self) -> float:
+        return random.Random(self.seed).uniform(-10, 10)
+
+    def score(self) -> int:
+        return int(self.utility())
+
+    def children(self) -> Iterator[Tree]:
+        for i in range(3):
+            yield Tree(self.seed * 7 + i + 1, self.depth + 1, self.moves + [i])
+
+    def outcomes(self) -> Iterator[tuple[float, Tree]]:
+        rng = random.Random(self.seed)
+        weights = [rng.random() + 0.1 for _ in range(3)]
+        for weight, child in zip(weights, self.children()):
+            yield weight / sum(weights), child
+
+    def value(self) -> float:
+        """Expectimax value without any pruning."""
+        if self.is_terminal():
+            return self.utility()
+        if self.is_chance():
+            return sum(p * c.value() for p, c in self.outcomes())
+        values = [c.value() for c in self.children()]
+        return max(values) if self.is_maximising() else min(values)
+
+    # unused by expectimax, part of the Node protocol
+    def __lt__(self, other: Tree) -> bool:
+        return self.score() < other.score()
+
+    def __le__(self, other: Tree) -> bool:
+        return self.score() <= other.score()
+
+    def __gt__(self, other: Tree) -> bool:
+        return self.score() > other.score()
+
+    def __ge__(self, other: Tree) -> bool:
+        return self.score() >= other.score()
+
+    def minimum(self) -> Tree:
+        return self
+
+    def maximum(self) -> Tree:
+        return self
+
+
+@pytest.mark.parametrize("seed", range(1, 21))
+def test_pruning_keeps_value(seed: int) -> None:
+    tree = Tree(seed)
+    got = expectimax(tree, depth=10, lower=-10, upper=10)
+    assert got == pytest.approx(tree.value())
+
+
+@pytest.mark.parametrize("seed", range(1, 6))
+def test_best_move(seed: int) -> None:
+    tree = Tree(seed)
+    best = expectimax_move(tree, depth=10, lower=-10, upper=10)
+    assert best.value() == pytest.approx(max(c.value() for c in tree.children()))
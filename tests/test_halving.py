@@ -0,0 +1,42 @@
+import pytest
+
+from conftest import play
+from new_wordle import BeamGuesser
+from wordle.halving import Schedule, errors, select
+from wordle.models import Vocabulary
+from wordle.prune import bucket_sizes, expected_size
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("sample", [2, 4, 8])
+def test_finalists_are_scored_exactly(
+    vocabulary: Vocabulary, seed: int, sample: int
+) -> None:
+    words = vocabulary.all()
+    schedule = Schedule(sample=sample, finalists=3)
+    got = select(vocabulary, words, words, schedule, seed=seed)
+    # halving stops early once the sample would be every word
+    assert 3 <= len(got) < len(words)
+    assert got == sorted(got)
+    for score, guess in got:
+        assert score == expected_size(bucket_sizes(vocabulary, guess, words))
+
+
+def test_whole_sample_is_exact(vocabulary: Vocabulary) -> None:
+    words = vocabulary.all()
+    got = select(vocabulary, words, words, Schedule(sample=len(words)))
+    exact = sorted(expected_size(bucket_sizes(vocabulary, g, words)) for g in words)
+    assert [score for score, _ in got] == exact
+
+
+def test_errors(vocabulary: Vocabulary) -> None:
+    words = vocabulary.all()
+    stats = errors(vocabulary, words, words, Schedule(sample=4, finalists=2), [0, 1])
+    assert 0 <= stats["best"] <= 1
+    assert stats["worst_rank"] >= stats["mean_rank"] >= 0
+    assert stats["worst_excess"] >= stats["mean_excess"] >= 0
+
+
+def test_beam_guesser_with_schedule(vocabulary: Vocabulary, aim: str) -> None:
+    guesser = BeamGuesser(vocabulary, width=3, schedule=Schedule(sample=4), seed=0)
+    assert len(play(guesser, aim)) <= 5
@@ -0,0 +1,61 @@
+import pytest
+
+from wordle import kernel
+from wordle.evaluate import feedback
+from wordle.models import Vocabulary
+from wordle.prune import bucket_sizes
+
+# repeated letters, the hard part of feedback
+REPEATS = ["eerie", "geese", "llama", "mamma", "sassy", "error"]
+
+
+@pytest.fixture
+def words(words: list[str]) -> list[str]:
+    return words + REPEATS
+
+
+@pytest.fixture
+def letters(words: list[str]) -> bytes:
+    return "".join(words).encode()
+
+
+def test_block_matches_feedback(words: list[str], letters: bytes) -> None:
+    spelled = kernel.spellings(letters)
+    table = kernel.block(spelled, spelled)
+    expected = [[feedback(aim, guess) for aim in words] for guess in words]
+    assert table.tolist() == expected
+
+
+@pytest.mark.parametrize("size", [1, 4, 7, 100])
+def test_blocks_cover_the_table(letters: bytes, size: int) -> None:
+    spelled = kernel.spellings(letters)
+    table = kernel.block(spelled, spelled)
+    seen = 0
+    for i, j, block in kernel.blocks(spelled, spelled[3:], size):
+        rows, columns = block.shape
+        assert rows <= size and columns <= size
+        assert (block == table[i:, 3 + j :][:rows, :columns]).all()
+        seen += block.size
+    assert seen == len(spelled) * (len(spelled) - 3)
+
+
+@pytest.mark.parametrize("size", [2, 5, 100])
+def test_partition_counts(vocabulary: Vocabulary, letters: bytes, size: int) -> None:
+    spelled = kernel.spellings(letters)
+    counts = kernel.partition_counts(spelled, spelled, size)
+    for guess, row in zip(vocabulary.all(), counts.tolist()):
+        expected = bucket_sizes(vocabulary, guess, vocabulary.all())
+        assert sorted(c for c in row if c) == sorted(expected)
+
+
+def test_rows_match_without_numpy(
+    words: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fast = Vocabulary(words, answers=words[5:])
+    monkeypatch.setattr(kernel, "AVAILABLE", False)
+    slow = Vocabulary(words, answers=words[5:])
+    for guess in slow.all():
+        assert slow.row(guess) == fast.row(guess)
+        assert slow.feedbacks(guess, slow.answers[2:]) == fast.feedbacks(
+            guess, fast.answers[2:]
+        )
@@ -0,0 +1,63 @@
+import io
+import json
+
+import pytest
+
+from wordle import kernel
+from wordle.evaluate import evaluate
+from wordle.logs import Analyser, Game, analyse, best_expected, read_csv, read_jsonl
+from wordle.models import Vocabulary
+from wordle.prune import bucket_sizes, expected_size
+
+
+def game(aim: str, guesses: list[str]) -> Game:
+    return Game(guesses=guesses, scores=[evaluate(aim, g) for g in guesses])
+
+
+def test_readers_agree() -> None:
+    expected = game("today", ["crate", "motto", "today"])
+    jsonl = io.StringIO(json.dumps(expected._asdict()) + "\n\n")
+    csv = io.StringIO(
+        "guesses,scores\n"
+        + f"{' '.join(expected.guesses)},{' '.join(expected.scores)}\n"
+    )
+    assert list(read_jsonl(jsonl)) == list(read_csv(csv)) == [expected]
+
+
+def test_analyse_skips_bad_games_and_streams(vocabulary: Vocabulary) -> None:
+    games = [
+        game("today", ["crate", "today"]),
+        Game(guesses=["zzzzz"], scores=["....."]),
+        Game(guesses=["crate"], scores=["====."]),
+        game("motto", ["crate", "abbot", "motto"]),
+    ]
+    summaries = list(analyse(Analyser(vocabulary), iter(games), every=1))
+
+    assert [s["games"] for s in summaries] == [1, 2, 2]
+    final = summaries[-1]
+    assert final["skipped"] == 2
+    assert final["turns"] == 5
+    by_turn = final["by_turn"]
+    assert isinstance(by_turn, dict)
+    assert by_turn[1]["mean_candidates"] == len(vocabulary)
+
+
+def test_positions_are_bounded_and_shared(vocabulary: Vocabulary) -> None:
+    analyser = Analyser(vocabulary, max_positions=3)
+    for aim in vocabulary.words:
+        list(analyser.turns(game(aim, ["crate", "motto", aim])))
+        assert len(analyser.positions) <= 3
+    assert () in analyser.positions
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_best_expected_tries_every_guess(
+    vocabulary: Vocabulary, numpy: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(kernel, "AVAILABLE", numpy and kernel.AVAILABLE)
+    for words in [vocabulary.all(), vocabulary.encode(["abbot", "today", "motto"])]:
+        expected = min(
+            expected_size(bucket_sizes(vocabulary, guess, words))
+            for guess in vocabulary.all()
+        )
+        assert best_expected(vocabulary, words) == pytest.approx(expected)
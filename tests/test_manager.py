@@ -0,0 +1,131 @@
+import sqlite3
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+import wordle.evaluate
+import wordle.models
+from wordle.cache import SolvedCache, position_key
+from wordle.manager import Delta, VocabularyManager, apply, load_table, save_table
+from wordle.models import Vocabulary
+
+# word lists changed from the words and answers
+Change = Callable[[list[str], list[str]], tuple[list[str], list[str] | None]]
+
+
+@pytest.fixture
+def answers(words: list[str]) -> list[str]:
+    return words[:10]
+
+
+def cached(words: list[str], answers: list[str] | None = None) -> Vocabulary:
+    vocabulary = Vocabulary(words, answers=answers)
+    for guess in vocabulary.all():
+        vocabulary.row(guess)
+    return vocabulary
+
+
+CHANGES: list[Change] = [
+    lambda w, a: (w, a),
+    lambda w, a: (w + ["bogus"], a),
+    lambda w, a: (w, a[2:]),
+    lambda w, a: (w, a + ["crate", "maxim"]),
+    lambda w, a: (w[1:] + ["bogus"], a[3:] + ["bogus"]),
+    lambda w, a: (w[::-1], None),
+]
+
+
+@pytest.mark.parametrize("change", CHANGES)
+def test_apply_matches_a_new_vocabulary(
+    words: list[str], answers: list[str], change: Change
+) -> None:
+    old = cached(words, answers)
+    words, new_answers = change(words, answers)
+    new = apply(old, Delta.between(old, words, new_answers))
+    fresh = Vocabulary(words, answers=new_answers)
+    assert new.version == fresh.version
+    assert set(new.words) == set(fresh.words)
+    assert set(new.decode(new.answers)) == set(fresh.decode(fresh.answers))
+    for word in new.words:
+        got = new.feedbacks(new.id(word), new.answers)
+        expected = fresh.feedbacks(
+            fresh.id(word), fresh.encode(new.decode(new.answers))
+        )
+        assert got == expected
+
+
+def test_only_new_columns_are_computed(
+    words: list[str], answers: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    old = cached(words, answers)
+    calls = []
+    feedback = wordle.evaluate.feedback
+
+    def counting(aim: bytes, guess: bytes) -> int:
+        calls.append(aim)
+        return feedback(aim, guess)
+
+    monkeypatch.setattr(wordle.models, "feedback", counting)
+    new = apply(old, Delta(answers_added=("crate",), answers_removed=("abbot",)))
+    assert len(calls) == len(words)
+    assert set(calls) == {b"crate"}
+    calls.clear()
+    new.row(new.id("crate"))
+    assert not calls
+
+
+def test_table_round_trip(
+    tmp_path: Path, words: list[str], answers: list[str]
+) -> None:
+    path = str(tmp_path / "feedback.table")
+    old = cached(words, answers)
+    save_table(old, path)
+    loaded = load_table(path)
+    assert loaded.version == old.version
+    assert loaded.table() == old.table()
+
+
+def test_stale_table_is_updated(
+    tmp_path: Path, words: list[str], answers: list[str]
+) -> None:
+    path = str(tmp_path / "feedback.table")
+    save_table(cached(words, answers), path)
+    manager = VocabularyManager.open(path, words, answers[1:])
+    assert manager.version == Vocabulary(words, answers[1:]).version
+    assert len(manager.vocabulary.table()) == len(words)
+    manager.save(path)
+    assert load_table(path).version == manager.version
+
+
+def test_cache_drops_changed_positions(
+    tmp_path: Path, words: list[str], answers: list[str]
+) -> None:
+    cache = SolvedCache(str(tmp_path / "solved.sqlite"))
+    old = Vocabulary(words, answers)
+    positions = [["abbot", "scorn"], ["today", "rider"], ["scorn", "today"]]
+    keys = [position_key(old, old.encode(p)) for p in positions]
+    for key, position in zip(keys, positions):
+        cache.put(key, depth=2, guess=position[0], value=1, words=position)
+    manager = VocabularyManager(old, cache)
+    manager.update(words, [w for w in answers if w != "scorn"])
+    assert cache.version == manager.version
+    assert [cache.get(k, depth=2) is not None for k in keys] == [False, True, False]
+
+
+def test_locked_cache_is_left_stale(
+    tmp_path: Path, words: list[str], answers: list[str]
+) -> None:
+    path = str(tmp_path / "solved.sqlite")
+    cache = SolvedCache(path, timeout=0.1)
+    old = Vocabulary(words, answers)
+    cache.version = old.version
+    key = position_key(old, old.encode(["abbot", "scorn"]))
+    cache.put(key, depth=2, guess="abbot", value=1, words=["abbot", "scorn"])
+    lock = sqlite3.connect(path, isolation_level=None)
+    lock.execute("BEGIN IMMEDIATE")
+    manager = VocabularyManager(old, cache)
+    manager.update(words, [w for w in answers if w != "scorn"])
+    lock.rollback()
+    assert cache.version == old.version
+    assert cache.get(key, depth=2) is not None
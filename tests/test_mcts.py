@@ -0,0 +1,81 @@
+from __future__ import annotations
+from typing import Iterator
+
+import pytest
+
+from conftest import play
+from new_wordle import MCTSGuesser
+from search.mcts import MCTS, mcts, random_child
+from wordle.evaluate import CORRECT_CODE
+from wordle.models import Vocabulary
+
+
+class Nim:
+    """Take one or two stones, whoever takes the last stone wins."""
+
+    def __init__(self, stones: int, depth: int = 0, moves: list[int] | None = None):
+        self.stones = stones
+        self.depth = depth
+        self.moves = [] if moves is None else moves
+
+    def is_maximising(self) -> bool:
+        return not self.depth % 2
+
+    def is_terminal(self) -> bool:
+        return not self.stones
+
+    def score(self) -> int:
+        # the player who just moved took the last stone
+        return -1 if self.is_maximising() else 1
+
+    def children(self) -> Iterator[Nim]:
+        for take in (1, 2):
+            if take <= self.stones:
+                yield Nim(self.stones - take, self.depth + 1, self.moves + [take])
+
+    # unused by mcts, part of the Node protocol
+    def __lt__(self, other: Nim) -> bool:
+        return self.score() < other.score()
+
+    def __le__(self, other: Nim) -> bool:
+        return self.score() <= other.score()
+
+    def __gt__(self, other: Nim) -> bool:
+        return self.score() > other.score()
+
+    def __ge__(self, other: Nim) -> bool:
+        return self.score() >= other.score()
+
+    def minimum(self) -> Nim:
+        return self
+
+    def maximum(self) -> Nim:
+        return self
+
+
+@pytest.mark.parametrize("stones,take", [(4, 1), (5, 2), (7, 1), (8, 2)])
+def test_finds_winning_move(stones: int, take: int) -> None:
+    best = mcts(Nim(stones), simulations=500, policy=random_child, seed=0)
+    assert best.moves == [take]
+
+
+def test_needs_a_budget() -> None:
+    with pytest.raises(ValueError):
+        MCTS(Nim(3)).search()
+
+
+def test_time_budget() -> None:
+    best = mcts(Nim(4), seconds=0.5, policy=random_child, seed=0)
+    assert best.moves == [1]
+
+
+def test_guesser_finds_aim(vocabulary: Vocabulary, aim: str) -> None:
+    guesser = MCTSGuesser(vocabulary, simulations=50, width=5, seed=0)
+    assert len(play(guesser, aim)) <= 4
+
+
+def test_guesser_needs_a_possible_answer(vocabulary: Vocabulary) -> None:
+    guesser = MCTSGuesser(vocabulary, simulations=10, seed=0)
+    # no answer is both unlike and equal to the opener
+    with pytest.raises(ValueError):
+        guesser(["crate", "crate"], [0, CORRECT_CODE])
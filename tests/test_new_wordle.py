@@ -0,0 +1,85 @@
+import itertools
+from typing import Callable
+
+import pytest
+
+from conftest import play
+from new_wordle import (
+    OPENER,
+    OPENER_MISSED,
+    AlphaBetaGuesser,
+    BeamGuesser,
+    ExpectimaxGuesser,
+    Guesser,
+    MCTSGuesser,
+    WordleNode,
+    opening_guess,
+)
+from wordle.evaluate import CORRECT_CODE, WRONG_CODE, feedback
+from wordle.models import Vocabulary
+
+# More words than feedback codes, so some word ids look like codes.
+MANY = ["".join(letters) for letters in itertools.product("aeilnorst", repeat=5)][
+    ::97
+][:300]
+
+GUESSERS: dict[str, Callable[[Vocabulary], Guesser]] = {
+    "alphabeta": AlphaBetaGuesser,
+    "beam": BeamGuesser,
+    "expectimax": ExpectimaxGuesser,
+    "mcts": lambda v: MCTSGuesser(v, simulations=50, width=5, seed=0),
+}
+
+
+def test_guessing_word_id_of_correct_code_is_not_a_win() -> None:
+    vocabulary = Vocabulary(MANY)
+    assert len(vocabulary) > CORRECT_CODE
+    root = WordleNode(
+        moves=[], vocabulary=vocabulary, words=vocabulary.all(), chance=True
+    )
+    (guessed,) = [c for c in root.children() if c.moves[-1] == CORRECT_CODE]
+    assert not guessed.is_terminal()
+    assert guessed.utility() <= -1
+    (solved,) = [o for _, o in guessed.outcomes() if o.moves[-1] == CORRECT_CODE]
+    assert solved.is_terminal()
+    assert solved.utility() == -1
+
+
+@pytest.mark.parametrize("name", GUESSERS)
+def test_opens_without_opener(words: list[str], name: str) -> None:
+    words.remove(OPENER)
+    vocabulary = Vocabulary(words)
+    assert opening_guess(vocabulary) in vocabulary
+    for aim in words:
+        guesses = play(GUESSERS[name](vocabulary), aim)
+        assert guesses[0] == opening_guess(vocabulary)
+        assert len(guesses) <= 6
+
+
+def test_searches_when_opener_misses_and_reply_is_not_allowed(
+    vocabulary: Vocabulary,
+) -> None:
+    assert OPENER_MISSED not in vocabulary
+    assert feedback("dizzy", OPENER) == WRONG_CODE
+    guesses = play(AlphaBetaGuesser(vocabulary), "dizzy")
+    assert guesses[0] == OPENER
+    assert len(guesses) <= 6
+
+
+def test_expectimax_on_more_words_than_codes() -> None:
+    vocabulary = Vocabulary(MANY)
+    # the word whose id is the code of a correct guess
+    decoy = vocabulary.word(CORRECT_CODE)
+    opener = opening_guess(vocabulary)
+    aims = [
+        aim
+        for aim in MANY
+        if feedback(aim, opener) == feedback(decoy, opener) and aim != decoy
+    ]
+    assert aims
+    for aim in aims:
+        guesser = ExpectimaxGuesser(vocabulary, depth=1, width=len(vocabulary))
+        guesses = play(guesser, aim)
+        # guessing the decoy is no win, nor the best of the candidates left
+        assert guesses[1] != decoy
+        assert len(guesses) <= 6
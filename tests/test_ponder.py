@@ -0,0 +1,92 @@
+import os
+import time
+
+import pytest
+
+from conftest import play
+from new_wordle import BeamGuesser, PonderingGuesser
+from wordle.evaluate import feedback
+from wordle.models import Vocabulary
+
+
+class CountingGuesser:
+    def __init__(self, vocabulary: Vocabulary) -> None:
+        self.inner = BeamGuesser(vocabulary, depth=1, width=3)
+        self.calls: list[tuple[list[str], list[int]]] = []
+
+    def __call__(self, guesses: list[str], scores: list[int]) -> str:
+        self.calls.append((guesses, scores))
+        return self.inner(guesses, scores)
+
+
+class PonderingFails(CountingGuesser):
+    """Guesses here, fails or hangs in the process pondering."""
+
+    def __init__(self, vocabulary: Vocabulary, error: Exception | None) -> None:
+        super().__init__(vocabulary)
+        self.error = error
+        self.pid = os.getpid()
+
+    def __call__(self, guesses: list[str], scores: list[int]) -> str:
+        if os.getpid() != self.pid:
+            if self.error is not None:
+                raise self.error
+            time.sleep(60)
+        return super().__call__(guesses, scores)
+
+
+def test_same_guesses_as_guesser(vocabulary: Vocabulary, aim: str) -> None:
+    pondering = PonderingGuesser(CountingGuesser(vocabulary), vocabulary, buckets=2)
+    plain = BeamGuesser(vocabulary, depth=1, width=3)
+
+    def checked(guesses: list[str], scores: list[int]) -> str:
+        guess = pondering(guesses, scores)
+        assert guess == plain(guesses, scores)
+        return guess
+
+    play(checked, aim)
+    pondering.stop()
+
+
+def test_likeliest_scores_are_pondered(vocabulary: Vocabulary) -> None:
+    counting = CountingGuesser(vocabulary)
+    pondering = PonderingGuesser(counting, vocabulary, buckets=1)
+    assert pondering([], []) == "crate"
+    assert pondering.process is not None
+    pondering.process.join()
+    scores = [feedback(aim, "crate") for aim in vocabulary.words]
+    likeliest = max(scores, key=scores.count)
+
+    pondering(["crate"], [likeliest])
+    # answered from the pondering, not asked again
+    assert counting.calls == [([], [])]
+    pondering.stop()
+
+
+def test_stale_search_is_stopped(vocabulary: Vocabulary) -> None:
+    pondering = PonderingGuesser(
+        PonderingFails(vocabulary, error=None), vocabulary, buckets=1
+    )
+    pondering([], [])
+    scores = [feedback(aim, "crate") for aim in vocabulary.words]
+    unlikeliest = min(scores, key=scores.count)
+    # the search for the likeliest score has started, and hangs
+    assert pondering.results is not None and pondering.results.poll(30)
+    start = time.perf_counter()
+    guess = pondering(["crate"], [unlikeliest])
+    assert time.perf_counter() - start < 30
+    plain = BeamGuesser(vocabulary, depth=1, width=3)
+    assert guess == plain(["crate"], [unlikeliest])
+    pondering.stop()
+
+
+def test_pondering_errors_are_raised(vocabulary: Vocabulary) -> None:
+    pondering = PonderingGuesser(
+        PonderingFails(vocabulary, error=KeyError("lost")), vocabulary, buckets=1
+    )
+    pondering([], [])
+    assert pondering.process is not None
+    pondering.process.join()
+    with pytest.raises(KeyError, match="lost"):
+        pondering(["crate"], [feedback("dizzy", "crate")])
+    assert pondering.process is None
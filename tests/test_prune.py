@@ -1,37 +1,18 @@
 import pytest
 
-from wordle.prune import prune
-
-
-WORDS = [
-    "abbot",
-    "scorn",
-    "today",
-    "rider",
-    "dizzy",
-    "crime",
-    "rakes",
-    "clear",
-    "leech",
-    "burnt",
-    "monic",
-    "motto",
-    "noose",
-    "maxim",
-    "crate",
-]
-
-
-def test_prune_correct_guess() -> None:
-    words = WORDS
-    guesses = [
-        "motto",
-    ]
-    statuses = ["====="]
+from wordle.evaluate import encode
+from wordle.models import Vocabulary
+from wordle.prune import partition, prune
+
+
+def test_prune_correct_guess(vocabulary: Vocabulary) -> None:
+    words = vocabulary.all()
+    guesses = vocabulary.encode(["motto"])
+    statuses = [encode("=====")]
     expected = ["motto"]
 
-    got = prune(words=words, guesses=guesses, statuses=statuses)
-    assert got == expected
+    got = prune(vocabulary, words=words, guesses=guesses, statuses=statuses)
+    assert vocabulary.decode(got) == expected
 
 
 @pytest.mark.parametrize(
@@ -41,12 +22,23 @@ def test_prune_correct_guess() -> None:
         ("motto", ".=-..", ["today"]),
     ),
 )
-def test_prune_single(guess: str, status: str, expected: list[str]) -> None:
-    words = WORDS
+def test_prune_single(
+    vocabulary: Vocabulary, guess: str, status: str, expected: list[str]
+) -> None:
+    words = vocabulary.all()
     guesses = [
-        guess,
+        vocabulary.id(guess),
     ]
-    statuses = [status]
+    statuses = [encode(status)]
+
+    got = prune(vocabulary, words=words, guesses=guesses, statuses=statuses)
+    assert vocabulary.decode(got) == expected
+
 
-    got = prune(words=words, guesses=guesses, statuses=statuses)
-    assert got == expected
+def test_partition(vocabulary: Vocabulary) -> None:
+    words = vocabulary.all()
+    buckets = partition(vocabulary, vocabulary.id("crate"), words)
+    assert sorted(w for bucket in buckets.values() for w in bucket) == list(words)
+    for status, bucket in buckets.items():
+        got = prune(vocabulary, words, [vocabulary.id("crate")], [status])
+        assert got == bucket
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+
+from wordle.models import Vocabulary
+from wordle.rank import Ranking, metrics, rank, read_rankings, write_rankings
+
+
+def test_metrics_single_answer(vocabulary: Vocabulary) -> None:
+    crate = vocabulary.encode(["crate"])
+    got = metrics(vocabulary, crate[0], crate)
+    assert got == Ranking("crate", worst=1, expected=1.0, entropy=0.0, buckets=1)
+
+
+def test_rank_resumes_from_checkpoint(
+    vocabulary: Vocabulary, tmp_path: Path
+) -> None:
+    checkpoint = str(tmp_path / "rank.partial")
+    done = metrics(vocabulary, vocabulary.id("crate"), vocabulary.all())
+    # a bogus checkpointed row proves it is reused rather than recomputed
+    write_rankings(checkpoint, [done._replace(buckets=-1)], vocabulary.words)
+
+    guesses = vocabulary.words[:4] + ["crate"]
+    got = rank(guesses, vocabulary.words, checkpoint, processes=2, chunk_size=2)
+
+    assert [r.guess for r in got] == guesses
+    assert got[-1].buckets == -1
+    assert got[:4] == [metrics(vocabulary, g, vocabulary.all()) for g in range(4)]
+    assert sorted(read_rankings(checkpoint, vocabulary.words)) == sorted(got)
+
+
+def test_rank_refuses_checkpoint_of_other_answers(
+    vocabulary: Vocabulary, tmp_path: Path
+) -> None:
+    checkpoint = str(tmp_path / "rank.partial")
+    rank(["crate"], vocabulary.words, checkpoint, processes=1)
+    with pytest.raises(ValueError):
+        rank(["crate"], vocabulary.words[1:], checkpoint, processes=1)
+
+
+def test_rank_skips_half_written_row(vocabulary: Vocabulary, tmp_path: Path) -> None:
+    checkpoint = tmp_path / "rank.partial"
+    guesses = vocabulary.words[:3]
+    rank(guesses, vocabulary.words, str(checkpoint), processes=1)
+    # cut off while writing the buckets of the last row
+    checkpoint.write_bytes(checkpoint.read_bytes()[:-3])
+    assert len(list(read_rankings(str(checkpoint), vocabulary.words))) == 2
+
+    got = rank(guesses, vocabulary.words, str(checkpoint), processes=1)
+    assert got == [metrics(vocabulary, g, vocabulary.all()) for g in range(3)]
+    assert sorted(read_rankings(str(checkpoint), vocabulary.words)) == sorted(got)
@@ -0,0 +1,57 @@
+import pytest
+
+from wordle.models import Vocabulary
+from wordle.prune import CORRECT_GUESS
+from wordle.solver import Solver, Strategy, prove
+
+
+def play(vocabulary: Vocabulary, strategy: Strategy, aim: int) -> int:
+    guesses = 1
+    while True:
+        status = vocabulary.feedback(guess=strategy.guess, aim=aim)
+        if status == CORRECT_GUESS:
+            return guesses
+        strategy = strategy.branches[status]
+        guesses += 1
+
+
+@pytest.mark.parametrize("depth", (3, 4))
+def test_solve_is_proof(vocabulary: Vocabulary, depth: int) -> None:
+    words = vocabulary.all()
+    strategy = Solver(vocabulary, guesses=words).solve(words, depth)
+    assert strategy is not None
+    assert (
+        max(play(vocabulary, strategy, aim) for aim in words)
+        == strategy.depth()
+        <= depth
+    )
+
+
+def test_solve_impossible(vocabulary: Vocabulary) -> None:
+    words = vocabulary.all()
+    assert Solver(vocabulary, guesses=words).solve(words, 1) is None
+
+
+def test_solver_memoises_failures(vocabulary: Vocabulary) -> None:
+    solver = Solver(vocabulary, guesses=vocabulary.all())
+    candidates = vocabulary.encode(["rakes", "crate"])
+    assert solver.solve(candidates, 1) is None
+    assert solver.failed[candidates.tobytes()] == 1
+
+
+def test_prove_reports_failing_bucket(vocabulary: Vocabulary) -> None:
+    words = vocabulary.all()
+    maxim = vocabulary.id("maxim")
+    strategy, failed = prove(vocabulary, maxim, words, words, depth=2)
+    assert strategy is None
+    assert failed
+    status = vocabulary.feedback(guess=maxim, aim=failed[0])
+    assert all(vocabulary.feedback(guess=maxim, aim=w) == status for w in failed)
+
+
+def test_solve_with_extra_guesses(words: list[str]) -> None:
+    vocabulary = Vocabulary(words, answers=["abbot", "dizzy", "leech"])
+    solver = Solver(vocabulary, guesses=vocabulary.all())
+    strategy = solver.solve(vocabulary.answers, 2)
+    assert strategy is not None
+    assert not vocabulary.is_answer(vocabulary.word(strategy.guess))
@@ -1,8 +1,10 @@
 from __future__ import annotations
+import argparse
 from enum import Enum
 from typing import Iterator
 
 import search
+from search.mcts import random_child
 
 
 class IllegalMove(Exception):
@@ -127,18 +129,26 @@ class Board:
                 yield self.move((rix, cix))
 
 
-def main() -> None:
+def main(simulations: int | None = None) -> None:
     soft = True
     board = Board.from_string("." * 9, Player.O)
     while True:
         # r, c = [int(m) for m in input("Move: ")]
         # board = board.move((r, c))
-        variation = search.alphabeta(
-            node=board,
-            a=board.minimum(),
-            b=board.maximum(),
-            soft=soft,
-        )
+        if simulations is None:
+            variation = search.alphabeta(
+                node=board,
+                a=board.minimum(),
+                b=board.maximum(),
+                soft=soft,
+            )
+        else:
+            variation = search.mcts(
+                board,
+                simulations=simulations,
+                policy=random_child,
+                exploration=10.0,
+            )
         board = board.move(variation.moves[board.depth])
         print(board.string())
         if board.is_terminal():
@@ -159,5 +169,9 @@ def main() -> None:
             break
 
 
+cli = argparse.ArgumentParser()
+cli.add_argument("--mcts", type=int, metavar="SIMULATIONS", help="Search by MCTS.")
+
+
 if __name__ == "__main__":
-    main()
+    main(simulations=cli.parse_args().mcts)
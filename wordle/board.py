@@ -3,7 +3,9 @@ from enum import Enum
 from typing import Iterator
 
 import search
-from wordle.evaluate import evaluate, _score
+from wordle.cache import SolvedCache, position_key
+from wordle.evaluate import decode, encode, _score
+from wordle.models import Vocabulary, Words, new_words
 from wordle.prune import prune, CORRECT_GUESS
 
 
@@ -12,18 +14,34 @@ class Player(Enum):
     O = "o"
 
 
+HEURISTIC_SECOND_GUESSES = {
+    encode("....."): "bingo",
+    encode("-...."): "block",
+    encode("....-"): "begin",
+}
+
+
 class Board:
     def __init__(
         self,
-        words: list[str],
-        moves: list[str],
-        statuses: list[str],
-        initial_guess: str,
+        vocabulary: Vocabulary,
+        words: Words,
+        moves: list[int],
+        statuses: list[int],
+        initial_guess: int,
         player: Player = Player.X,
         is_min: bool = False,
         is_max: bool = False,
+        guesses: Words | None = None,
     ):
+        """``words`` are the possible answers left, only they are pruned.
+
+        ``guesses`` are the allowed guesses, the words left if not given.
+
+        """
+        self.vocabulary = vocabulary
         self.words = words
+        self.guesses = guesses
         self.moves = moves
         self.statuses = statuses
         self.player = player
@@ -46,9 +64,9 @@ class Board:
     def __str__(self) -> str:
         s = ""
         for i, guess in enumerate(self.moves):
-            s += guess
+            s += self.vocabulary.word(guess)
             if len(self.statuses) > i:
-                s += " " + self.statuses[i]
+                s += " " + decode(self.statuses[i])
             else:
                 s += " " * 7
             if i == (len(self.moves) - 1):
@@ -64,7 +82,8 @@ class Board:
 
     def minimum(self) -> Board:
         return Board(
-            words=[],
+            vocabulary=self.vocabulary,
+            words=new_words(),
             moves=[],
             statuses=[],
             is_min=True,
@@ -73,7 +92,8 @@ class Board:
 
     def maximum(self) -> Board:
         return Board(
-            words=[],
+            vocabulary=self.vocabulary,
+            words=new_words(),
             moves=[],
             statuses=[],
             is_max=True,
@@ -89,16 +109,25 @@ class Board:
             return 0
         return _score(self.statuses[-1])
 
-    def evaluate(self, aim: str) -> Board:
-        statuses = self.statuses + [evaluate(aim, self.moves[-1])]
-        words = prune(words=self.words, guesses=self.moves, statuses=statuses)
-        words = sorted(words, key=lambda w: -len(set(w)))
+    def evaluate(self, aim: int) -> Board:
+        status = self.vocabulary.feedback(guess=self.moves[-1], aim=aim)
+        statuses = self.statuses + [status]
+        words = prune(
+            self.vocabulary,
+            words=self.words,
+            guesses=self.moves[-1:],
+            statuses=statuses[-1:],
+        )
+        distinct = self.vocabulary.distinct
+        words = new_words(sorted(words, key=lambda w: -distinct[w]))
         return Board(
+            vocabulary=self.vocabulary,
             words=words,
             moves=self.moves,
             statuses=statuses,
             player=self.next_player(),
             initial_guess=self.initial_guess,
+            guesses=self.guesses,
         )
 
     def is_terminal(self) -> bool:
@@ -108,17 +137,26 @@ class Board:
         correct = any(s == CORRECT_GUESS for s in self.statuses)
         return run_out_of_guesses or correct
 
-    def move(self, move: str) -> Board:
+    def allowed_guesses(self) -> Words:
+        return self.words if self.guesses is None else self.guesses
+
+    def move(self, move: int) -> Board:
         # words = self.words
-        if move not in self.words:
-            raise ValueError(f"Guess '{move}' not in words, might struggle.")
+        if move not in self.allowed_guesses():
+            word = self.vocabulary.word(move)
+            raise ValueError(f"Guess '{word}' not in words, might struggle.")
+        return self._move(move)
+
+    def _move(self, move: int) -> Board:
         # words = sorted(words, key=lambda w: len(set(w)))
         new_board = Board(
+            vocabulary=self.vocabulary,
             words=self.words,
             moves=self.moves + [move],
             statuses=self.statuses,
             player=self.next_player(),
             initial_guess=self.initial_guess,
+            guesses=self.guesses,
         )
 
         return new_board
@@ -126,38 +164,58 @@ class Board:
     def children(self) -> Iterator[Board]:
         if self.is_terminal():
             return
-        is_max = self.is_maximising()
-        for word in self.words:
-            if is_max:
-                yield self.move(move=word)
-            else:
+        if self.is_maximising():
+            for guess in self.allowed_guesses():
+                yield self._move(move=guess)
+        else:
+            for word in self.words:
                 yield self.evaluate(aim=word)
 
-    def heuristic(self) -> str | None:
+    def heuristic(self) -> int | None:
         if not self.moves:
-            return "crate"
+            return self.initial_guess
         # based on what's seen as the next guess
         # using the "tiny" word list of ~ 2.3k
         # and soft alpha-beta pruning
         if len(self.statuses) == 1:
-            if self.statuses[-1] == ".....":
-                return "bingo"
-            if self.statuses[-1] == "-....":
-                return "block"
-            if self.statuses[-1] == "....-":
-                return "begin"
+            word = HEURISTIC_SECOND_GUESSES.get(self.statuses[-1])
+            if word is not None and word in self.vocabulary:
+                return self.vocabulary.id(word)
         return None
 
-    def guess(self, soft: bool = True) -> Board:
+    def guess(self, soft: bool = True, cache: SolvedCache | None = None) -> Board:
         # maybe_move = self.heuristic()
-        if maybe_move := self.heuristic():
+        if (maybe_move := self.heuristic()) is not None:
             move = maybe_move
+        elif cache is None:
+            move, _ = self.search(soft)
         else:
-            variation = search.alphabeta(
-                self,
-                a=self.minimum(),
-                b=self.maximum(),
-                soft=soft,
+            key = position_key(
+                self.vocabulary,
+                self.words,
+                self.guesses,
+                namespace=f"board soft={soft}",
             )
-            move = variation.moves[len(self.moves)]
+            depth = 6 - len(self.statuses)
+            if (hit := cache.get(key, depth)) is not None:
+                move = self.vocabulary.id(hit[0])
+            else:
+                move, value = self.search(soft)
+                cache.put(
+                    key,
+                    depth,
+                    guess=self.vocabulary.word(move),
+                    value=value,
+                    words=self.vocabulary.decode(self.words),
+                )
         return self.move(move)
+
+    def search(self, soft: bool = True) -> tuple[int, int]:
+        """Best move and its backed-up score."""
+        variation = search.alphabeta(
+            self,
+            a=self.minimum(),
+            b=self.maximum(),
+            soft=soft,
+        )
+        return variation.moves[len(self.moves)], variation.score()
@@ -0,0 +1,235 @@
+"""Solved positions kept on disk, shared between runs and processes.
+
+A position is the set of possible answers left, the allowed guesses and the
+number of guesses remaining. Keys are built from the words themselves so
+they are the same whatever the ids in a particular ``Vocabulary``.
+
+>>> vocabulary = Vocabulary(["abbot", "scorn", "today"])
+>>> cache = SolvedCache(":memory:")
+>>> key = position_key(vocabulary, vocabulary.encode(["today", "abbot"]))
+>>> cache.get(key, depth=3) is None
+True
+>>> cache.put(key, depth=3, guess="today", value=4)
+>>> cache.get(key, depth=3)
+('today', 4)
+"""
+
+from __future__ import annotations
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable
+
+from wordle.models import Vocabulary, Words
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    key TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    guess TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (key, depth)
+);
+CREATE TABLE IF NOT EXISTS candidates (
+    key TEXT NOT NULL,
+    word TEXT NOT NULL,
+    PRIMARY KEY (key, word)
+);
+CREATE INDEX IF NOT EXISTS candidates_word ON candidates (word);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def position_key(
+    vocabulary: Vocabulary,
+    words: Words,
+    guesses: Words | None = None,
+    namespace: str = "",
+) -> str:
+    """Canonical key of the answers left and the allowed guesses.
+
+    ``guesses`` of None means guessing among the answers left.
+    ``namespace`` separates results of different searches.
+
+    """
+    h = hashlib.sha1(namespace.encode())
+    h.update(b"|answers|")
+    h.update(",".join(sorted(vocabulary.decode(words))).encode())
+    if guesses is not None:
+        h.update(b"|guesses|")
+        h.update(",".join(sorted(vocabulary.decode(guesses))).encode())
+    return h.hexdigest()
+
+
+class SolvedCache:
+    """SQLite store mapping a position key and depth to a best guess and value.
+
+    Safe to share between processes and threads: each opens its own
+    connection, the database is in WAL mode and writers wait for ``timeout``
+    seconds.
+    Least recently used positions are evicted beyond ``max_entries``.
+    Caching is best effort, a locked database is logged and skipped.
+
+    Positions put with their candidate ``words`` can be dropped with
+    ``invalidate`` once those words change. ``version`` records the version
+    of the vocabulary the cache was last invalidated for.
+
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 100_000,
+        timeout: float = 30.0,
+    ) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # connections must not be shared with other threads or forked processes
+        local = self._local
+        connection: sqlite3.Connection | None = getattr(local, "connection", None)
+        if connection is None or local.pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            local.connection, local.pid = connection, os.getpid()
+        return connection
+
+    def get(self, key: str, depth: int) -> tuple[str, int] | None:
+        try:
+            row = self.connection.execute(
+                "SELECT guess, value FROM positions WHERE key = ? AND depth = ?",
+                (key, depth),
+            ).fetchone()
+            if row is None:
+                return None
+            self.connection.execute(
+                "UPDATE positions SET used = ? WHERE key = ? AND depth = ?",
+                (time.time(), key, depth),
+            )
+        except sqlite3.OperationalError as e:
+            logger.warning("cache read failed: %s", e)
+            return None
+        logger.debug("cache hit key=%s depth=%s", key, depth)
+        return row[0], row[1]
+
+    def put(
+        self,
+        key: str,
+        depth: int,
+        guess: str,
+        value: int,
+        words: Iterable[str] = (),
+    ) -> None:
+        try:
+            with self.connection as c:
+                c.execute("BEGIN IMMEDIATE")
+                c.execute(
+                    "INSERT OR REPLACE INTO positions VALUES (?, ?, ?, ?, ?)",
+                    (key, depth, guess, value, time.time()),
+                )
+                c.executemany(
+                    "INSERT OR IGNORE INTO candidates VALUES (?, ?)",
+                    ((key, word) for word in words),
+                )
+                self._evict(c)
+        except sqlite3.OperationalError as e:
+            logger.warning("cache write failed: %s", e)
+
+    def invalidate(self, words: Iterable[str]) -> int | None:
+        """Drop positions with any of ``words`` among their candidates.
+
+        Returns the number dropped. Positions put without their words stay.
+        Like ``put`` this is best effort, a locked database is logged and
+        None returned.
+
+        """
+        try:
+            with self.connection as c:
+                c.execute("BEGIN IMMEDIATE")
+                c.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS changed "
+                    "(word TEXT PRIMARY KEY)"
+                )
+                c.execute("DELETE FROM changed")
+                c.executemany(
+                    "INSERT OR IGNORE INTO changed VALUES (?)", ((w,) for w in words)
+                )
+                dropped = c.execute(
+                    "DELETE FROM positions WHERE key IN (SELECT key FROM candidates "
+                    "WHERE word IN (SELECT word FROM changed))"
+                ).rowcount
+                self._forget_candidates(c)
+        except sqlite3.OperationalError as e:
+            logger.warning("cache invalidation failed: %s", e)
+            return None
+        logger.info("invalidated %s positions", dropped)
+        return int(dropped)
+
+    @property
+    def version(self) -> str | None:
+        row = self.connection.execute(
+            "SELECT value FROM meta WHERE name = 'version'"
+        ).fetchone()
+        return None if row is None else str(row[0])
+
+    @version.setter
+    def version(self, version: str) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,)
+        )
+
+    def _forget_candidates(self, c: sqlite3.Connection) -> None:
+        c.execute(
+            "DELETE FROM candidates WHERE key NOT IN (SELECT key FROM positions)"
+        )
+
+    def _evict(self, c: sqlite3.Connection) -> None:
+        (count,) = c.execute("SELECT COUNT(*) FROM positions").fetchone()
+        if count <= self.max_entries:
+            return
+        # evict a tenth at once so writes do not each pay for an eviction
+        excess = count - self.max_entries + self.max_entries // 10
+        logger.info("evicting %s positions", excess)
+        c.execute(
+            "DELETE FROM positions WHERE rowid IN "
+            "(SELECT rowid FROM positions ORDER BY used, rowid LIMIT ?)",
+            (excess,),
+        )
+        self._forget_candidates(c)
+
+    def __len__(self) -> int:
+        (count,) = self.connection.execute(
+            "SELECT COUNT(*) FROM positions"
+        ).fetchone()
+        return int(count)
+
+    def close(self) -> None:
+        """Close the connection of this thread."""
+        if getattr(self._local, "connection", None) is not None:
+            self._local.connection.close()
+            self._local.connection = None
+
+    def __getstate__(self) -> dict[str, object]:
+        # connections are opened again by whoever unpickles the cache
+        return {k: v for k, v in self.__dict__.items() if k != "_local"}
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
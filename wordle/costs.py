@@ -0,0 +1,214 @@
+"""Predicting how long guessing strategies take.
+
+A cost model predicts the seconds a strategy takes to guess from a position,
+given the number of possible answers left and the guesses made, as
+
+    log(seconds) = a + b * log(candidates) + c * guesses
+
+fitted by least squares to timings from ``calibrate``. Models are saved as
+JSON, so calibrating once on a machine serves every later game.
+
+The number of allowed guesses is not fitted: every timing is on one
+vocabulary, so it is the same throughout and indistinguishable from ``a``.
+Searches score every allowed guess to choose those to search, so costs are
+taken as proportional to it, scaled from the size of the vocabulary
+calibrated on.
+
+>>> model = CostModel({"beam": [math.log(0.001), 1.0, 0.0]}, words=1000)
+>>> round(model.predict("beam", candidates=100, guesses=1), 3)
+0.1
+>>> round(model.predict("beam", candidates=100, guesses=1, words=2000), 3)
+0.2
+"""
+
+from __future__ import annotations
+import json
+import logging
+import math
+import multiprocessing
+import time
+from multiprocessing.connection import Connection
+from typing import Callable, Mapping
+
+from wordle.models import Vocabulary
+from wordle.prune import prune
+
+logger = logging.getLogger(__name__)
+
+
+# Guesses and their feedback codes so far.
+Position = tuple[list[str], list[int]]
+# Seconds under which a guess came without a search, say from an opening
+# book. Costs are modelled on searches only.
+SHORTCUT = 1e-3
+
+
+def features(candidates: int, guesses: int) -> list[float]:
+    return [1.0, math.log(candidates), float(guesses)]
+
+
+def fit(xs: list[list[float]], ys: list[float]) -> list[float]:
+    """Least squares coefficients, by the normal equations.
+
+    >>> xs = [[1.0, 1.0], [1.0, 2.0], [1.0, 3.0]]
+    >>> [round(c, 3) for c in fit(xs, [1.0, 3.0, 5.0])]
+    [-1.0, 2.0]
+    """
+    n = len(xs[0])
+    # a little ridge keeps too few or collinear timings solvable
+    a = [
+        [sum(x[i] * x[j] for x in xs) + (1e-6 if i == j else 0.0) for j in range(n)]
+        for i in range(n)
+    ]
+    b = [sum(x[i] * y for x, y in zip(xs, ys)) for i in range(n)]
+    return solve(a, b)
+
+
+def solve(a: list[list[float]], b: list[float]) -> list[float]:
+    """Solve ``a x = b`` by Gaussian elimination with partial pivoting."""
+    n = len(b)
+    rows = [row[:] + [v] for row, v in zip(a, b)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(col + 1, n):
+            factor = rows[r][col] / rows[col][col]
+            rows[r] = [v - factor * p for v, p in zip(rows[r], rows[col])]
+    x = [0.0] * n
+    for r in reversed(range(n)):
+        done = sum(rows[r][c] * x[c] for c in range(r + 1, n))
+        x[r] = (rows[r][n] - done) / rows[r][r]
+    return x
+
+
+class CostModel:
+    """Coefficients of the cost of each strategy, by name.
+
+    ``words`` is the size of the vocabulary the model was calibrated on.
+
+    """
+
+    def __init__(
+        self, coefficients: dict[str, list[float]], words: int | None = None
+    ) -> None:
+        self.coefficients = coefficients
+        self.words = words
+
+    def __contains__(self, strategy: str) -> bool:
+        return strategy in self.coefficients
+
+    def predict(
+        self, strategy: str, candidates: int, guesses: int, words: int | None = None
+    ) -> float:
+        """Seconds ``strategy`` is expected to take to guess from ``words``."""
+        x = features(candidates, guesses)
+        seconds = math.exp(
+            sum(c * v for c, v in zip(self.coefficients[strategy], x))
+        )
+        if words is None or self.words is None:
+            return seconds
+        return seconds * words / self.words
+
+    @classmethod
+    def load(cls, path: str) -> CostModel:
+        with open(path) as f:
+            saved = json.load(f)
+        return cls(saved["coefficients"], words=saved.get("words"))
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(
+                {"coefficients": self.coefficients, "words": self.words}, f, indent=2
+            )
+
+
+def timed(
+    strategy: Callable[[list[str], list[int]], str],
+    guesses: list[str],
+    scores: list[int],
+    sender: Connection,
+) -> None:
+    """Send the seconds ``strategy`` takes to guess, or the error it raised."""
+    start = time.perf_counter()
+    try:
+        strategy(guesses, scores)
+    except Exception as error:
+        sender.send((None, error))
+    else:
+        sender.send((time.perf_counter() - start, None))
+
+
+def deadline(
+    strategy: Callable[[list[str], list[int]], str],
+    guesses: list[str],
+    scores: list[int],
+    limit: float,
+) -> float | None:
+    """Seconds ``strategy`` takes to guess, None if not done in ``limit`` seconds.
+
+    The guess is made in a process of its own, stopped at the deadline.
+
+    """
+    results, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=timed, args=(strategy, guesses, scores, sender), daemon=True
+    )
+    process.start()
+    sender.close()
+    try:
+        if not results.poll(limit):
+            return None
+        seconds, error = results.recv()
+    finally:
+        process.terminate()
+        process.join()
+        results.close()
+    if error is not None:
+        raise error
+    return float(seconds)
+
+
+def calibrate(
+    vocabulary: Vocabulary,
+    strategies: Mapping[str, Callable[[list[str], list[int]], str]],
+    positions: list[Position],
+    limit: float = 10.0,
+    shortcut: float = SHORTCUT,
+) -> CostModel:
+    """Time each strategy on ``positions`` and fit a model to the timings.
+
+    Positions are timed smallest first, and a strategy not done within
+    ``limit`` seconds is stopped, counted as taking ``limit`` and not timed
+    on larger ones, its cost there is extrapolated. Timings start without
+    cached feedback rows, as games do. Guesses that took less than
+    ``shortcut`` seconds are left out.
+
+    """
+    sized = []
+    for guesses, scores in positions:
+        words = prune(
+            vocabulary,
+            words=vocabulary.answers,
+            guesses=vocabulary.encode(guesses).tolist(),
+            statuses=scores,
+        )
+        sized.append((len(words), guesses, scores))
+    sized.sort(key=lambda p: p[0])
+    coefficients = {}
+    for name, strategy in strategies.items():
+        xs, ys = [], []
+        for candidates, guesses, scores in sized:
+            vocabulary.clear()
+            seconds = deadline(strategy, guesses, scores, limit)
+            logger.info("%s candidates=%s seconds=%s", name, candidates, seconds)
+            if seconds is not None and seconds < shortcut:
+                continue
+            xs.append(features(candidates, len(guesses)))
+            ys.append(math.log(limit if seconds is None else seconds))
+            if seconds is None:
+                break
+        if not xs:
+            logger.warning("%s never searched, not modelled", name)
+            continue
+        coefficients[name] = fit(xs, ys)
+    return CostModel(coefficients, words=len(vocabulary))
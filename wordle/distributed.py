@@ -0,0 +1,446 @@
+"""Proving start words with workers over TCP.
+
+The coordinator expands the AND/OR tree of ``wordle.solver`` down to the
+``split`` ply itself, positions there are jobs: a candidate set and the
+guesses left. Workers connect, receive the vocabulary, then solve one job at
+a time with their own memoised ``Solver``. As results come in the coordinator
+rebuilds the tree from them, trying the next guess where a job failed, until
+the start word is proved or refuted. The search is as exact as ``prove``.
+
+Results are appended to a JSONL checkpoint, so a restarted coordinator
+only hands out the jobs left. Jobs of workers that disconnect, or take
+longer than ``job_timeout``, are handed to another worker.
+
+Jobs and results are pickled, so anyone who knows the authkey can run code
+on the coordinator and workers. Without an authkey the coordinator only
+listens on the loopback interface, with a random one for its own workers.
+Start a coordinator, here with two local workers, and add workers anywhere
+that can reach it, sharing a secret in ``WORDLE_AUTHKEY``::
+
+    export WORDLE_AUTHKEY=...
+    python -m wordle.distributed --host 0.0.0.0 coordinate crate \
+        --depth 5 --workers 2
+    python -m wordle.distributed --host coordinator.example work
+"""
+
+from __future__ import annotations
+import argparse
+import ipaddress
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import Client, Connection, Listener, wait
+from typing import Any
+
+from wordle.cache import position_key
+from wordle.models import Vocabulary, Words, new_words
+from wordle.prune import CORRECT_GUESS, partition
+from wordle.solver import Solver, Strategy
+
+logger = logging.getLogger(__name__)
+
+
+# Result of a position whose jobs are not all solved yet.
+PENDING = object()
+# Environment variable of the secret shared with workers.
+AUTHKEY = "WORDLE_AUTHKEY"
+
+
+def is_loopback(host: str) -> bool:
+    """Whether ``host`` is only reachable from this machine.
+
+    >>> is_loopback("localhost"), is_loopback("127.0.0.1"), is_loopback("0.0.0.0")
+    (True, True, False)
+    """
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class Job:
+    """Solve ``candidates`` within ``depth`` guesses among ``guesses``.
+
+    A job is given another ``timeout`` each time it is handed out.
+
+    """
+
+    def __init__(
+        self,
+        vocabulary: Vocabulary,
+        candidates: Words,
+        guesses: Words,
+        depth: int,
+        timeout: float | None = None,
+    ) -> None:
+        self.candidates = candidates
+        self.depth = depth
+        self.timeout = timeout
+        self.key = position_key(
+            vocabulary, candidates, guesses, namespace=f"depth={depth}"
+        )
+
+
+def work(address: tuple[str, int], authkey: bytes) -> None:
+    """Solve jobs from the coordinator at ``address`` until it stops."""
+    try:
+        conn = Client(address, authkey=authkey)
+    except (ConnectionError, EOFError):
+        logger.warning("no coordinator at %s", address)
+        return
+    except multiprocessing.AuthenticationError:
+        logger.warning("authkey rejected by coordinator at %s", address)
+        return
+    with conn:
+        if (hello := conn.recv()) is None:
+            return
+        vocabulary, guesses = hello
+        solver = Solver(vocabulary, guesses=guesses)
+        logger.info("worker pid=%s connected to %s", os.getpid(), address)
+        while True:
+            try:
+                job = conn.recv()
+            except EOFError:
+                break
+            if job is None:
+                break
+            key, candidates, depth = job
+            strategy = solver.solve(new_words(candidates), depth)
+            result = None if strategy is None else strategy.to_dict(vocabulary)
+            try:
+                conn.send((key, result))
+            except OSError:
+                # taken for hung, the job was handed to another worker
+                logger.warning("coordinator dropped worker pid=%s", os.getpid())
+                break
+
+
+class Coordinator:
+    """Hands out the jobs of proving ``start`` and assembles their results.
+
+    Listening beyond the loopback interface needs an ``authkey``, without
+    one a random key is made for local workers, see ``authkey``.
+    A job not solved within ``job_timeout`` seconds is taken from its
+    worker and handed to another, with twice the time.
+
+    """
+
+    def __init__(
+        self,
+        vocabulary: Vocabulary,
+        start: int,
+        candidates: Words,
+        guesses: Words,
+        depth: int,
+        split: int = 1,
+        checkpoint: str | None = None,
+        address: tuple[str, int] = ("localhost", 0),
+        authkey: bytes | None = None,
+        job_timeout: float | None = 3600.0,
+    ) -> None:
+        if split < 1:
+            raise ValueError(f"Split at ply 1 or deeper, not {split}.")
+        if authkey is None and not is_loopback(address[0]):
+            raise ValueError(f"Listening on {address[0]} needs an authkey.")
+        self.vocabulary = vocabulary
+        self.start = start
+        self.candidates = candidates
+        self.guesses = guesses
+        self.depth = depth
+        self.split = split
+        self.checkpoint = checkpoint
+        self.authkey = os.urandom(32) if authkey is None else authkey
+        self.job_timeout = job_timeout
+        # ranking guesses is the coordinator's only real work, rank once
+        self.solver = Solver(vocabulary, guesses=guesses)
+        self.ordered: dict[tuple[bytes, int], list[tuple[int, dict[int, Words]]]] = (
+            {}
+        )
+        self.jobs: dict[tuple[bytes, int], Job] = {}
+        self.results: dict[str, Strategy | None] = {}
+        self.missing: dict[str, Job] = {}
+        self.queued: deque[Job] = deque()
+        self.assigned: dict[Connection, Job] = {}
+        self.deadlines: dict[Connection, float] = {}
+        self.idle: list[Connection] = []
+        self.connections: queue.Queue[Connection] = queue.Queue()
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self.load(checkpoint)
+        self.listener = Listener(address, authkey=self.authkey)
+        self.lock = threading.Lock()
+        self.closed = False
+
+    @property
+    def address(self) -> tuple[str, int]:
+        address: tuple[str, int] = self.listener.address
+        return address
+
+    def load(self, path: str) -> None:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    strategy = record["strategy"]
+                    self.results[record["key"]] = (
+                        None
+                        if strategy is None
+                        else Strategy.from_dict(self.vocabulary, strategy)
+                    )
+        logger.info("loaded %s results from %s", len(self.results), path)
+
+    def save(self, key: str, result: dict[str, Any] | None) -> None:
+        if self.checkpoint is None:
+            return
+        with open(self.checkpoint, "a") as f:
+            f.write(json.dumps({"key": key, "strategy": result}) + "\n")
+
+    def run(self) -> Strategy | None:
+        """Strategy proving the start word, or None if it fails."""
+        threading.Thread(target=self.accept, daemon=True).start()
+        try:
+            while (result := self.assemble()) is PENDING:
+                self.dispatch()
+                self.receive()
+        finally:
+            self.close()
+        assert result is None or isinstance(result, Strategy)
+        return result
+
+    def accept(self) -> None:
+        while True:
+            try:
+                conn = self.listener.accept()
+            except OSError:
+                # closed
+                return
+            except multiprocessing.AuthenticationError as e:
+                logger.warning("rejected worker: %s", e)
+                continue
+            with self.lock:
+                if self.closed:
+                    conn.send(None)
+                    conn.close()
+                    continue
+                conn.send((self.vocabulary, self.guesses))
+                self.connections.put(conn)
+
+    def assemble(self) -> Strategy | None | object:
+        """Rebuild the proof from the results so far, noting missing jobs."""
+        self.missing = {}
+        buckets = partition(self.vocabulary, self.start, self.candidates)
+        return self.assemble_guess(self.start, buckets, self.depth, ply=0)
+
+    def assemble_guess(
+        self,
+        guess: int,
+        buckets: dict[int, Words],
+        depth: int,
+        ply: int,
+    ) -> Strategy | None | object:
+        branches: dict[int, Strategy] = {}
+        pending = False
+        for status, bucket in sorted(buckets.items(), key=lambda b: -len(b[1])):
+            if status == CORRECT_GUESS:
+                continue
+            branch = self.assemble_position(bucket, depth - 1, ply + 1)
+            if branch is None:
+                return None
+            if branch is PENDING:
+                # keep going, a later bucket may fail the guess now
+                pending = True
+                continue
+            assert isinstance(branch, Strategy)
+            branches[status] = branch
+        return PENDING if pending else Strategy(guess=guess, branches=branches)
+
+    def assemble_position(
+        self,
+        candidates: Words,
+        depth: int,
+        ply: int,
+    ) -> Strategy | None | object:
+        if not candidates or depth < 1:
+            return None
+        if len(candidates) == 1:
+            return Strategy(guess=candidates[0], branches={})
+        if depth == 1:
+            return None
+        key = (candidates.tobytes(), depth)
+        if ply >= self.split:
+            if (job := self.jobs.get(key)) is None:
+                job = self.jobs[key] = Job(
+                    self.vocabulary,
+                    candidates,
+                    self.guesses,
+                    depth,
+                    timeout=self.job_timeout,
+                )
+            if job.key in self.results:
+                return self.results[job.key]
+            self.missing[job.key] = job
+            return PENDING
+        if key not in self.ordered:
+            self.ordered[key] = list(self.solver.ordered_guesses(candidates, depth))
+        for guess, buckets in self.ordered[key]:
+            result = self.assemble_guess(guess, buckets, depth, ply)
+            if result is not None:
+                # the next guess is only tried once this one has failed
+                return result
+        return None
+
+    def dispatch(self) -> None:
+        while not self.connections.empty():
+            self.idle.append(self.connections.get())
+        # drop jobs no longer needed, a sibling failed their guess
+        self.queued = deque(j for j in self.queued if j.key in self.missing)
+        handed = {job.key for job in self.assigned.values()}
+        handed.update(job.key for job in self.queued)
+        self.queued.extend(j for k, j in self.missing.items() if k not in handed)
+        while self.idle and self.queued:
+            conn, job = self.idle.pop(), self.queued.popleft()
+            try:
+                conn.send((job.key, job.candidates.tolist(), job.depth))
+            except OSError:
+                self.queued.appendleft(job)
+                conn.close()
+                continue
+            self.assigned[conn] = job
+            if job.timeout is not None:
+                self.deadlines[conn] = time.monotonic() + job.timeout
+
+    def receive(self, timeout: float = 0.5) -> None:
+        for conn in wait(list(self.assigned), timeout=timeout):
+            assert isinstance(conn, Connection)
+            job = self.assigned.pop(conn)
+            self.deadlines.pop(conn, None)
+            try:
+                key, result = conn.recv()
+            except (EOFError, OSError):
+                logger.warning(
+                    "worker died, requeueing %s words", len(job.candidates)
+                )
+                self.queued.appendleft(job)
+                conn.close()
+                continue
+            self.results[key] = (
+                None
+                if result is None
+                else Strategy.from_dict(self.vocabulary, result)
+            )
+            self.save(key, result)
+            logger.info("solved=%s jobs=%s", result is not None, len(self.results))
+            self.idle.append(conn)
+        self.expire()
+
+    def expire(self) -> None:
+        """Requeue the jobs of workers past their deadline, dropping the workers."""
+        now = time.monotonic()
+        for conn in [c for c, t in self.deadlines.items() if t < now]:
+            job = self.assigned.pop(conn)
+            del self.deadlines[conn]
+            assert job.timeout is not None
+            logger.warning(
+                "worker hung for %ss, requeueing %s words",
+                job.timeout,
+                len(job.candidates),
+            )
+            # it may be slow rather than hung, give the next worker longer
+            job.timeout *= 2
+            self.queued.appendleft(job)
+            conn.close()
+
+    def close(self) -> None:
+        # workers accepted from now on are stopped by the accept thread
+        with self.lock:
+            self.closed = True
+            while not self.connections.empty():
+                self.idle.append(self.connections.get())
+        self.listener.close()
+        for conn in self.idle + list(self.assigned):
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            conn.close()
+        self.idle, self.assigned, self.deadlines = [], {}, {}
+
+
+cli = argparse.ArgumentParser(description="Prove a start word with TCP workers.")
+cli.add_argument("--host", default="localhost", help="Coordinator address.")
+cli.add_argument("--port", type=int, default=6000)
+cli.add_argument(
+    "--authkey",
+    default=os.environ.get(AUTHKEY),
+    help=f"Secret shared with workers, {AUTHKEY} by default.",
+)
+cli.add_argument("--log-level", default="WARNING")
+commands = cli.add_subparsers(dest="command", required=True)
+coordinate = commands.add_parser("coordinate")
+coordinate.add_argument("start")
+coordinate.add_argument("--vocabulary", default="words/words-tiny.txt")
+coordinate.add_argument("--answers")
+coordinate.add_argument("--depth", type=int, default=6)
+coordinate.add_argument("--split", type=int, default=1, help="Ply of the jobs.")
+coordinate.add_argument("--checkpoint", help="JSONL of solved jobs to resume from.")
+coordinate.add_argument("--workers", type=int, default=0, help="Local workers.")
+coordinate.add_argument(
+    "--job-timeout",
+    type=float,
+    default=3600.0,
+    help="Seconds before a job is requeued.",
+)
+coordinate.add_argument("--show", action="store_true", help="Print the proof tree.")
+commands.add_parser("work")
+
+
+if __name__ == "__main__":
+    args = cli.parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+    authkey = None if args.authkey is None else args.authkey.encode()
+    if args.command == "work":
+        if authkey is None:
+            cli.error(f"workers need --authkey or {AUTHKEY}")
+        work((args.host, args.port), authkey)
+    else:
+        if authkey is None and not is_loopback(args.host):
+            cli.error(f"listening on {args.host} needs --authkey or {AUTHKEY}")
+        if authkey is None and args.workers == 0:
+            # the random authkey is known to local workers only
+            cli.error(f"give --workers, or --authkey or {AUTHKEY} for other workers")
+        vocabulary = Vocabulary.from_file(args.vocabulary, answers_path=args.answers)
+        coordinator = Coordinator(
+            vocabulary,
+            start=vocabulary.id(args.start),
+            candidates=vocabulary.answers,
+            guesses=vocabulary.all(),
+            depth=args.depth,
+            split=args.split,
+            checkpoint=args.checkpoint,
+            address=(args.host, args.port),
+            authkey=authkey,
+            job_timeout=args.job_timeout,
+        )
+        # spawned, as forked workers would inherit the listening socket
+        spawn = multiprocessing.get_context("spawn")
+        for _ in range(args.workers):
+            spawn.Process(
+                target=work,
+                args=(coordinator.address, coordinator.authkey),
+                daemon=True,
+            ).start()
+        strategy = coordinator.run()
+        if strategy is None:
+            print(f"'{args.start}' fails within {args.depth} guesses")
+        else:
+            print(
+                f"'{args.start}' solves all words within {strategy.depth()} guesses"
+            )
+            if args.show:
+                print(strategy.format(vocabulary))
@@ -1,5 +1,5 @@
 import functools
-
+from typing import AnyStr
 
 SCORES = {
     ".": 0,
@@ -32,5 +32,66 @@ def evaluate(aim: str, guess: str) -> str:
 
 
 @functools.cache
-def _score(gs: str) -> int:
-    return sum(SCORES[s] for s in gs)
+def _score(code: int) -> int:
+    return sum(SCORES[s] for s in decode(code))
+
+
+# Feedback codes: status characters as base 3 digits, first letter least significant.
+DIGITS = {".": 0, "-": 1, "=": 2}
+POWERS = (1, 3, 9, 27, 81)
+CORRECT_CODE = 242
+WRONG_CODE = 0
+
+
+def feedback(aim: AnyStr, guess: AnyStr) -> int:
+    """Feedback code of a guess, same rules as ``evaluate``.
+
+    >>> feedback("rasps", "crate") == encode(evaluate("rasps", "crate"))
+    True
+    >>> feedback(b"scorn", b"scorn") == CORRECT_CODE
+    True
+    """
+    code = 0
+    for i, (aimc, guessc) in enumerate(zip(aim, guess)):
+        if aimc == guessc:
+            code += 2 * POWERS[i]
+        elif guessc in aim and aim.count(guessc) > guess[:i].count(guessc):
+            code += POWERS[i]
+    return code
+
+
+@functools.cache
+def encode(status: str) -> int:
+    """
+    >>> encode("....."), encode("-...."), encode("....="), encode("=====")
+    (0, 1, 162, 242)
+    """
+    return sum(DIGITS[s] * p for s, p in zip(status, POWERS))
+
+
+def parse(status: str) -> int:
+    """Feedback code of a status typed in, checking it is one.
+
+    >>> parse(" ..-=. ")
+    63
+    >>> parse("..-x.")
+    Traceback (most recent call last):
+    ...
+    ValueError: Score characters must be one of '.-=', not 'x'.
+    """
+    status = status.strip()
+    if len(status) != len(POWERS):
+        raise ValueError(f"Score must be {len(POWERS)} characters long.")
+    for s in status:
+        if s not in DIGITS:
+            raise ValueError(f"Score characters must be one of '.-=', not '{s}'.")
+    return encode(status)
+
+
+@functools.cache
+def decode(code: int) -> str:
+    """
+    >>> decode(162)
+    '....='
+    """
+    return "".join(".-="[code // p % 3] for p in POWERS)
@@ -0,0 +1,140 @@
+"""Guess selection by successive halving.
+
+Scoring every guess exactly costs a feedback per guess and candidate.
+Instead every guess is scored on a random sample of the candidates and only
+the best ``keep`` fraction survives. The sample then grows by ``growth`` and
+the survivors are scored again, until at most ``finalists`` guesses remain
+or the sample would be every candidate. Survivors are scored exactly.
+
+Guesses are scored, as elsewhere, by the number of candidates expected
+to be left, preferring candidates on ties.
+
+>>> vocabulary = Vocabulary(["abbot", "scorn", "today", "rider", "crate"])
+>>> words = vocabulary.all()
+>>> schedule = Schedule(sample=2, finalists=2)
+>>> ranked = select(vocabulary, words, words, schedule, seed=1)
+>>> [(round(score, 2), vocabulary.word(guess)) for score, guess in ranked]
+[(1.0, 'abbot'), (1.0, 'today')]
+"""
+
+from __future__ import annotations
+import argparse
+import copy
+import json
+import logging
+import math
+import random
+import time
+from collections import Counter
+from typing import NamedTuple
+
+from wordle.models import Vocabulary, Words, new_words
+from wordle.prune import bucket_sizes, expected_size
+
+logger = logging.getLogger(__name__)
+
+
+class Schedule(NamedTuple):
+    sample: int = 64
+    growth: float = 2.0
+    keep: float = 0.5
+    finalists: int = 10
+
+
+def sampled_score(vocabulary: Vocabulary, guess: int, sample: Words) -> float:
+    """Expected words left of the sample, without computing a whole row."""
+    return expected_size(list(Counter(vocabulary.feedbacks(guess, sample)).values()))
+
+
+def select(
+    vocabulary: Vocabulary,
+    words: Words,
+    guesses: Words,
+    schedule: Schedule = Schedule(),
+    seed: int | None = None,
+) -> list[tuple[float, int]]:
+    """Exact scores of the guesses surviving ``schedule``, best first."""
+    rng = random.Random(seed)
+    candidates = set(words)
+    survivors = list(guesses)
+    size = schedule.sample
+    while len(survivors) > schedule.finalists and size < len(words):
+        sample = new_words(rng.sample(list(words), size))
+        ranked = sorted(
+            (sampled_score(vocabulary, g, sample), g not in candidates, g)
+            for g in survivors
+        )
+        kept = max(schedule.finalists, math.ceil(len(ranked) * schedule.keep))
+        survivors = [g for *_, g in ranked[:kept]]
+        logger.debug("sample=%s survivors=%s", size, len(survivors))
+        size = math.ceil(size * schedule.growth)
+    exact = sorted(
+        (expected_size(bucket_sizes(vocabulary, g, words)), g not in candidates, g)
+        for g in survivors
+    )
+    return [(score, g) for score, _, g in exact]
+
+
+def errors(
+    vocabulary: Vocabulary,
+    words: Words,
+    guesses: Words,
+    schedule: Schedule,
+    seeds: list[int],
+) -> dict[str, float]:
+    """How sampled selection compares to exact scoring, over ``seeds``.
+
+    ``rank`` is where the selected guess comes in the exact ranking,
+    0 being the best, ``excess`` how many more words it is expected to leave.
+    Each run starts without cached feedback rows, to time it fairly.
+
+    """
+    start = time.perf_counter()
+    cold = copy.copy(vocabulary)
+    exact = sorted(expected_size(bucket_sizes(cold, g, words)) for g in guesses)
+    exact_seconds = time.perf_counter() - start
+    ranks, excesses, seconds = [], [], []
+    for seed in seeds:
+        start = time.perf_counter()
+        cold = copy.copy(vocabulary)
+        (score, _), *_ = select(cold, words, guesses, schedule, seed)
+        seconds.append(time.perf_counter() - start)
+        # guesses scoring the same are as good as each other
+        ranks.append(sum(s < score for s in exact))
+        excesses.append(score - exact[0])
+    return {
+        "best": sum(not r for r in ranks) / len(seeds),
+        "mean_rank": sum(ranks) / len(seeds),
+        "worst_rank": max(ranks),
+        "mean_excess": sum(excesses) / len(seeds),
+        "worst_excess": max(excesses),
+        "exact_seconds": exact_seconds,
+        "mean_seconds": sum(seconds) / len(seeds),
+    }
+
+
+cli = argparse.ArgumentParser(description="Compare sampled to exact guess scoring.")
+cli.add_argument("--vocabulary", default="words/words.txt", help="Allowed guesses.")
+cli.add_argument("--answers", default="words/words-tiny.txt")
+cli.add_argument("--sample", type=int, default=Schedule().sample)
+cli.add_argument("--growth", type=float, default=Schedule().growth)
+cli.add_argument("--keep", type=float, default=Schedule().keep)
+cli.add_argument("--finalists", type=int, default=Schedule().finalists)
+cli.add_argument("--seed", type=int, default=0, help="First of the seeds.")
+cli.add_argument("--trials", type=int, default=5, help="Seeds to try.")
+cli.add_argument("--log-level", default="WARNING")
+
+
+if __name__ == "__main__":
+    args = cli.parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+    vocabulary = Vocabulary.from_file(args.vocabulary, answers_path=args.answers)
+    schedule = Schedule(args.sample, args.growth, args.keep, args.finalists)
+    stats = errors(
+        vocabulary,
+        vocabulary.answers,
+        vocabulary.all(),
+        schedule,
+        seeds=list(range(args.seed, args.seed + args.trials)),
+    )
+    print(json.dumps(stats, indent=2))
@@ -0,0 +1,105 @@
+"""Feedback codes of blocks of guesses against blocks of answers, with NumPy.
+
+Words are rows of a ``uint8[N, 5]`` array of letters, as packed in
+``Vocabulary.letters``. A block of feedback codes takes a few array
+operations instead of a Python call per guess and answer, so vocabularies
+without a precomputed table are quick to score. Duplicate letters count
+as in ``evaluate``: a letter out of place is present while the answer has
+more of it than the guess has before it.
+
+Whole tables are computed ``size`` words square at a time, in bounded
+memory, to stream them out with ``blocks`` or reduce them to the number of
+answers giving each feedback with ``partition_counts``.
+
+NumPy is optional, without it ``AVAILABLE`` is False and feedback is
+computed by ``wordle.evaluate`` alone.
+
+>>> words = spellings(b"rasps" b"crate" b"speed")
+>>> block(words[:1], words)
+array([[242,   4,  36]], dtype=uint8)
+>>> from wordle.evaluate import feedback
+>>> [feedback(aim, "rasps") for aim in ["rasps", "crate", "speed"]]
+[242, 4, 36]
+>>> counts = partition_counts(words, words)
+>>> [{int(c): int(n) for c, n in enumerate(row) if n} for row in counts]
+[{4: 1, 36: 1, 242: 1}, {12: 1, 81: 1, 242: 1}, {4: 1, 9: 1, 242: 1}]
+"""
+
+from __future__ import annotations
+from typing import Iterator, Sequence
+
+from wordle.evaluate import POWERS
+
+try:
+    import numpy as np
+    from numpy.typing import NDArray
+
+    AVAILABLE = True
+except ImportError:
+    AVAILABLE = False
+
+
+# Words a side of the blocks computed at once, some megabytes of arrays.
+BLOCK = 512
+
+
+def spellings(letters: bytes, ids: Sequence[int] | None = None) -> NDArray[np.uint8]:
+    """Words packed in ``letters`` as rows of letters, only ``ids`` if given."""
+    words = np.frombuffer(letters, dtype=np.uint8).reshape(-1, len(POWERS))
+    return words if ids is None else words[np.asarray(ids, dtype=np.intp)]
+
+
+def block(
+    guesses: NDArray[np.uint8], answers: NDArray[np.uint8]
+) -> NDArray[np.uint8]:
+    """Feedback code of every guess against every answer, guesses by answers."""
+    g = guesses[:, None, :]
+    a = answers[None, :, :]
+    correct = g == a
+    # times each guess letter is in the answer
+    present = np.zeros(correct.shape, dtype=np.uint8)
+    for i in range(len(POWERS)):
+        present += g == a[:, :, i, None]
+    # times each guess letter is in the guess before it
+    before = np.tril(np.ones((len(POWERS), len(POWERS)), dtype=bool), k=-1)
+    same = guesses[:, :, None] == guesses[:, None, :]
+    earlier = (same & before).sum(axis=2, dtype=np.uint8)[:, None, :]
+    digits = 2 * correct + (~correct & (present > earlier))
+    codes: NDArray[np.uint8] = (digits * np.array(POWERS, dtype=np.uint8)).sum(
+        axis=2, dtype=np.uint8
+    )
+    return codes
+
+
+def row(guess: bytes, answers: NDArray[np.uint8]) -> bytes:
+    """Feedback codes of the spelling of ``guess`` against every answer."""
+    return bytes(block(spellings(guess), answers)[0])
+
+
+def blocks(
+    guesses: NDArray[np.uint8],
+    answers: NDArray[np.uint8],
+    size: int = BLOCK,
+) -> Iterator[tuple[int, int, NDArray[np.uint8]]]:
+    """Blocks of the feedback table with the guess and answer they start at."""
+    for i in range(0, len(guesses), size):
+        for j in range(0, len(answers), size):
+            yield i, j, block(guesses[i:][:size], answers[j:][:size])
+
+
+def partition_counts(
+    guesses: NDArray[np.uint8],
+    answers: NDArray[np.uint8],
+    size: int = BLOCK,
+) -> NDArray[np.int64]:
+    """Answers giving each feedback code to each guess, ``int64[guesses, 243]``."""
+    codes = 3 ** len(POWERS)
+    counts = np.zeros((len(guesses), codes), dtype=np.int64)
+    for i, _, table in blocks(guesses, answers, size):
+        rows = len(table)
+        # offset each guess's codes so one bincount counts them all
+        flat = table + (np.arange(rows) * codes)[:, None]
+        counts[i:][:rows] += np.bincount(
+            flat.ravel(), minlength=rows * codes
+        ).reshape(rows, codes)
+    return counts
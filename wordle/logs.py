@@ -0,0 +1,222 @@
+"""Streaming analysis of recorded games.
+
+Games are (guesses, scores) histories, read lazily from JSONL::
+
+    {"guesses": ["crate", "rates", "rasps"], "scores": [".--..", "==..=", "====="]}
+
+or CSV with space separated ``guesses`` and ``scores`` columns.
+Games are analysed turn by turn, holding only the current game, a bounded
+cache of positions keyed by shared prefixes and running aggregates.
+
+>>> vocabulary = Vocabulary(["abbot", "scorn", "today", "rider", "crate"])
+>>> analyser = Analyser(vocabulary)
+>>> turns = list(analyser.turns(Game(["crate", "today"], ["..--.", "====="])))
+>>> [(t.turn, t.candidates, t.remaining) for t in turns]
+[(1, 5, 2), (2, 2, 1)]
+>>> round(turns[0].information, 3), round(turns[0].gap, 3)
+(1.322, 0.4)
+"""
+
+from __future__ import annotations
+import argparse
+import csv
+import json
+import logging
+import math
+import sys
+from collections import OrderedDict
+from typing import IO, Iterable, Iterator, NamedTuple
+
+from wordle import kernel
+from wordle.evaluate import encode
+from wordle.models import Vocabulary, Words
+from wordle.prune import bucket_sizes, expected_size, prune
+
+logger = logging.getLogger(__name__)
+
+
+class Game(NamedTuple):
+    guesses: list[str]
+    scores: list[str]
+
+
+class Turn(NamedTuple):
+    """One analysed guess.
+
+    ``gap`` is how many more answers are expected to remain after the guess
+    than after the best guess, ``information`` the bits the feedback gave.
+
+    """
+
+    turn: int
+    candidates: int
+    remaining: int
+    information: float
+    gap: float
+
+
+def read_jsonl(f: IO[str]) -> Iterator[Game]:
+    for line in f:
+        if line.strip():
+            record = json.loads(line)
+            yield Game(guesses=record["guesses"], scores=record["scores"])
+
+
+def read_csv(f: IO[str]) -> Iterator[Game]:
+    for row in csv.DictReader(f):
+        yield Game(guesses=row["guesses"].split(), scores=row["scores"].split())
+
+
+class Position(NamedTuple):
+    words: Words
+    best: float
+
+
+def best_expected(vocabulary: Vocabulary, words: Words) -> float:
+    """Fewest of ``words`` expected to remain after any guess.
+
+    Every guess is tried, in blocks with NumPy when available.
+
+    """
+    if len(words) <= 2:
+        # guessing one leaves the other alone, if any
+        return 1.0
+    if not kernel.AVAILABLE:
+        return min(
+            expected_size(bucket_sizes(vocabulary, guess, words))
+            for guess in vocabulary.all()
+        )
+    counts = kernel.partition_counts(
+        kernel.spellings(vocabulary.letters),
+        kernel.spellings(vocabulary.letters, words),
+    )
+    return int((counts * counts).sum(axis=1).min()) / len(words)
+
+
+class Analyser:
+    """Analyses games, caching up to ``max_positions`` positions.
+
+    Positions are keyed by the (guess, score) prefix leading to them,
+    so games sharing openings share the expensive best guess search.
+
+    """
+
+    def __init__(self, vocabulary: Vocabulary, max_positions: int = 10_000) -> None:
+        self.vocabulary = vocabulary
+        self.max_positions = max_positions
+        self.positions: OrderedDict[tuple[int, ...], Position] = OrderedDict()
+
+    def position(self, prefix: tuple[int, ...]) -> Position:
+        if (position := self.positions.get(prefix)) is not None:
+            self.positions.move_to_end(prefix)
+            return position
+        if prefix:
+            *_, guess, score = prefix
+            previous = self.position(prefix[:-2]).words
+            words = prune(self.vocabulary, previous, [guess], [score])
+        else:
+            words = self.vocabulary.answers
+        best = best_expected(self.vocabulary, words)
+        position = self.positions[prefix] = Position(words=words, best=best)
+        if len(self.positions) > self.max_positions:
+            self.positions.popitem(last=False)
+        return position
+
+    def turns(self, game: Game) -> Iterator[Turn]:
+        prefix: tuple[int, ...] = ()
+        for i, (guess, score) in enumerate(zip(game.guesses, game.scores)):
+            position = self.position(prefix)
+            guess_id = self.vocabulary.id(guess)
+            prefix += (guess_id, encode(score))
+            played = expected_size(
+                bucket_sizes(self.vocabulary, guess_id, position.words)
+            )
+            words = prune(self.vocabulary, position.words, [guess_id], [prefix[-1]])
+            remaining = len(words)
+            if not remaining:
+                raise ValueError(f"Scores inconsistent with answers: {game}")
+            yield Turn(
+                turn=i + 1,
+                candidates=len(position.words),
+                remaining=remaining,
+                information=math.log2(len(position.words) / remaining),
+                gap=played - position.best,
+            )
+
+
+class Aggregates:
+    """Running totals overall and per turn number."""
+
+    def __init__(self) -> None:
+        self.games = 0
+        self.skipped = 0
+        self.turns: dict[int, list[float]] = {}
+
+    def add(self, turn: Turn) -> None:
+        totals = self.turns.setdefault(turn.turn, [0, 0.0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += turn.candidates
+        totals[2] += turn.information
+        totals[3] += turn.gap
+
+    def summary(self) -> dict[str, object]:
+        count = sum(t[0] for t in self.turns.values())
+        return {
+            "games": self.games,
+            "skipped": self.skipped,
+            "turns": count,
+            "mean_guesses": count / self.games if self.games else 0.0,
+            "by_turn": {
+                n: {
+                    "turns": int(t[0]),
+                    "mean_candidates": t[1] / t[0],
+                    "mean_information": t[2] / t[0],
+                    "mean_gap": t[3] / t[0],
+                }
+                for n, t in sorted(self.turns.items())
+            },
+        }
+
+
+def analyse(
+    analyser: Analyser,
+    games: Iterable[Game],
+    every: int = 0,
+) -> Iterator[dict[str, object]]:
+    """Yield the aggregates every ``every`` games, and once at the end."""
+    aggregates = Aggregates()
+    for game in games:
+        try:
+            turns = list(analyser.turns(game))
+        except (KeyError, ValueError) as e:
+            logger.warning("skipping game: %s", e)
+            aggregates.skipped += 1
+            continue
+        aggregates.games += 1
+        for turn in turns:
+            aggregates.add(turn)
+        if every and not aggregates.games % every:
+            yield aggregates.summary()
+    yield aggregates.summary()
+
+
+cli = argparse.ArgumentParser(description="Analyse recorded games.")
+cli.add_argument("logs", nargs="?", help="Game log, standard input if not given.")
+cli.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+cli.add_argument("--vocabulary", default="words/words.txt", help="Allowed guesses.")
+cli.add_argument("--answers", default="words/words-tiny.txt")
+cli.add_argument("--every", type=int, default=1000, help="Games between outputs.")
+cli.add_argument("--max-positions", type=int, default=10_000)
+cli.add_argument("--log-level", default="WARNING")
+
+
+if __name__ == "__main__":
+    args = cli.parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+    vocabulary = Vocabulary.from_file(args.vocabulary, answers_path=args.answers)
+    analyser = Analyser(vocabulary, max_positions=args.max_positions)
+    read = read_jsonl if args.format == "jsonl" else read_csv
+    f = sys.stdin if args.logs is None else open(args.logs, newline="")
+    with f:
+        for summary in analyse(analyser, read(f), every=args.every):
+            print(json.dumps(summary), flush=True)
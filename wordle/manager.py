@@ -0,0 +1,248 @@
+"""Keeping derived tables up to date as the word lists change.
+
+Word lists change as answers are retired and new guesses allowed. Rather
+than recomputing everything derived from a ``Vocabulary``, changes are
+applied as a ``Delta``: feedback rows are carried over to the new
+vocabulary, computing only rows of new guesses and columns of new answers,
+and only solved positions whose candidates include a changed word are
+dropped from a ``SolvedCache``.
+
+Feedback rows are saved as a table along with the words they were computed
+for and their ``version``, so a table for other word lists is detected when
+loaded and brought up to date rather than used or thrown away::
+
+    python -m wordle.manager --vocabulary words/words.txt \
+        --answers words/words-tiny.txt --table feedback.table
+
+>>> old = Vocabulary(["abbot", "scorn", "today", "crate"])
+>>> words = ["abbot", "today", "crate", "rider"]
+>>> delta = Delta.between(old, words, ["today", "rider"])
+>>> delta.added, delta.removed, delta.answers_added
+(('rider',), ('scorn',), ('rider',))
+>>> delta.answers_removed
+('abbot', 'scorn', 'crate')
+>>> new = apply(old, delta)
+>>> new.words, list(new.answers)
+(['today', 'rider', 'abbot', 'crate'], [0, 1])
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import logging
+import os
+from typing import NamedTuple
+
+from wordle.cache import SolvedCache
+from wordle.models import Vocabulary
+
+logger = logging.getLogger(__name__)
+
+
+class Delta(NamedTuple):
+    """Changes to a vocabulary.
+
+    Removed words are no longer allowed, nor answers. Retired answers, in
+    ``answers_removed`` but not ``removed``, may still be guessed.
+
+    """
+
+    added: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+    answers_added: tuple[str, ...] = ()
+    answers_removed: tuple[str, ...] = ()
+
+    @classmethod
+    def between(
+        cls,
+        vocabulary: Vocabulary,
+        words: list[str],
+        answers: list[str] | None = None,
+    ) -> Delta:
+        """Changes from ``vocabulary`` to one of ``words`` and ``answers``."""
+        answers = words if answers is None else answers
+        allowed = dict.fromkeys(answers + words)
+        possible = set(answers)
+        return cls(
+            added=tuple(w for w in allowed if w not in vocabulary),
+            removed=tuple(w for w in vocabulary.words if w not in allowed),
+            answers_added=tuple(
+                w for w in dict.fromkeys(answers) if not vocabulary.is_answer(w)
+            ),
+            answers_removed=tuple(
+                w for w in vocabulary.decode(vocabulary.answers) if w not in possible
+            ),
+        )
+
+    def changed(self) -> set[str]:
+        return {
+            *self.added,
+            *self.removed,
+            *self.answers_added,
+            *self.answers_removed,
+        }
+
+
+def apply(vocabulary: Vocabulary, delta: Delta) -> Vocabulary:
+    """The vocabulary after ``delta``, with the feedback rows still valid.
+
+    Words kept stay in order, new words come after them, answers first.
+
+    """
+    removed = set(delta.removed)
+    retired = removed | set(delta.answers_removed)
+    old_answers = vocabulary.decode(vocabulary.answers)
+    answers = [w for w in old_answers if w not in retired]
+    answers += [w for w in delta.answers_added if w not in removed]
+    words = [w for w in vocabulary.words if w not in removed] + list(delta.added)
+    updated = Vocabulary(words, answers=answers)
+    taken = updated.reuse(old_answers, vocabulary.table())
+    logger.info("version=%s rows taken over=%s", updated.version, taken)
+    return updated
+
+
+def save_table(vocabulary: Vocabulary, path: str) -> None:
+    """Save the cached feedback rows of ``vocabulary`` and its words."""
+    table = vocabulary.table()
+    header = {
+        "version": vocabulary.version,
+        "words": vocabulary.words,
+        "answers": len(vocabulary.answers),
+        "rows": list(table),
+    }
+    # written aside and moved, a table is never half written
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(json.dumps(header).encode() + b"\n")
+        for row in table.values():
+            f.write(row)
+    os.replace(f"{path}.tmp", path)
+
+
+def load_table(path: str) -> Vocabulary:
+    """The vocabulary a table was saved for, with its feedback rows."""
+    with open(path, "rb") as f:
+        header = json.loads(f.readline())
+        rows = f.read()
+    words = header["words"]
+    vocabulary = Vocabulary(words, answers=words[: header["answers"]])
+    if vocabulary.version != header["version"]:
+        raise ValueError(f"Table {path} does not match its own words.")
+    size = len(vocabulary.answers)
+    if len(rows) != size * len(header["rows"]):
+        raise ValueError(f"Table {path} is truncated.")
+    starts = range(0, len(rows), size)
+    table = {
+        w: rows[start : start + size] for w, start in zip(header["rows"], starts)
+    }
+    vocabulary.reuse(vocabulary.decode(vocabulary.answers), table)
+    return vocabulary
+
+
+class VocabularyManager:
+    """A vocabulary kept up to date with its word lists.
+
+    Each ``Delta`` applied replaces ``vocabulary`` with one carrying over
+    its feedback rows and, with a ``cache``, drops the solved positions
+    whose candidates include a changed word: they can no longer arise.
+    Ids change between versions, ``Words`` of one version are not of the next.
+
+    """
+
+    def __init__(self, vocabulary: Vocabulary, cache: SolvedCache | None = None):
+        self.vocabulary = vocabulary
+        self.cache = cache
+
+    @classmethod
+    def open(
+        cls,
+        path: str,
+        words: list[str],
+        answers: list[str] | None = None,
+        cache: SolvedCache | None = None,
+    ) -> VocabularyManager:
+        """Manager of ``words`` and ``answers`` starting from the table at ``path``.
+
+        A table saved for other word lists is stale, it is updated.
+
+        """
+        if not os.path.exists(path):
+            manager = cls(Vocabulary(words, answers=answers), cache)
+        else:
+            manager = cls(load_table(path), cache)
+        if cache is not None and cache.version not in (None, manager.version):
+            logger.warning(
+                "cache is of version %s, not %s, changed positions may linger",
+                cache.version,
+                manager.version,
+            )
+        if (delta := Delta.between(manager.vocabulary, words, answers)) != Delta():
+            logger.warning("table %s of version %s is stale", path, manager.version)
+            manager.apply(delta)
+        elif cache is not None:
+            cache.version = manager.version
+        return manager
+
+    @property
+    def version(self) -> str:
+        return self.vocabulary.version
+
+    def apply(self, delta: Delta) -> Vocabulary:
+        self.vocabulary = apply(self.vocabulary, delta)
+        # a cache left stale keeps its version, to be warned about when opened
+        if (
+            self.cache is not None
+            and self.cache.invalidate(delta.changed()) is not None
+        ):
+            self.cache.version = self.version
+        return self.vocabulary
+
+    def update(
+        self, words: list[str], answers: list[str] | None = None
+    ) -> Vocabulary:
+        """Apply the changes to the vocabulary of ``words`` and ``answers``."""
+        return self.apply(Delta.between(self.vocabulary, words, answers))
+
+    def save(self, path: str) -> None:
+        save_table(self.vocabulary, path)
+
+
+cli = argparse.ArgumentParser(description="Update a feedback table to word lists.")
+cli.add_argument("--vocabulary", default="words/words.txt", help="Allowed guesses.")
+cli.add_argument("--answers", default="words/words-tiny.txt")
+cli.add_argument(
+    "--table", default="feedback.table", help="Feedback table to update."
+)
+cli.add_argument("--cache", help="SQLite file of solved positions to invalidate.")
+cli.add_argument(
+    "--complete", action="store_true", help="Compute the rows of every guess."
+)
+cli.add_argument("--log-level", default="WARNING")
+
+
+if __name__ == "__main__":
+    args = cli.parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+    words = Vocabulary.from_file(args.vocabulary).words
+    answers = (
+        None if args.answers is None else Vocabulary.from_file(args.answers).words
+    )
+    manager = VocabularyManager.open(
+        args.table,
+        words,
+        answers,
+        cache=None if args.cache is None else SolvedCache(args.cache),
+    )
+    if args.complete:
+        for guess in manager.vocabulary.all():
+            manager.vocabulary.row(guess)
+    manager.save(args.table)
+    print(
+        json.dumps(
+            {
+                "version": manager.version,
+                "words": len(manager.vocabulary),
+                "answers": len(manager.vocabulary.answers),
+                "rows": len(manager.vocabulary.table()),
+            }
+        )
+    )
@@ -0,0 +1,211 @@
+"""Integer representation of words.
+
+Words are ids into a ``Vocabulary``, sets of candidate words are compact
+arrays of ids, and feedback is an integer code (see ``wordle.evaluate``).
+Strings are only needed to read word lists and to show words to users.
+
+>>> vocabulary = Vocabulary(["abbot", "scorn", "today"])
+>>> vocabulary.id("today")
+2
+>>> vocabulary.decode(vocabulary.encode(["scorn", "abbot"]))
+['scorn', 'abbot']
+>>> vocabulary.letters[5:10]
+b'scorn'
+>>> from wordle.evaluate import decode
+>>> decode(vocabulary.feedback(guess=0, aim=2))
+'-..--'
+
+Guesses may be allowed that can never be the answer.
+Answers come first, so answer ids are ``0 .. len(answers) - 1``.
+
+>>> vocabulary = Vocabulary(["abbot", "scorn", "today"], answers=["today"])
+>>> vocabulary.words, list(vocabulary.answers)
+(['today', 'abbot', 'scorn'], [0])
+>>> vocabulary.is_answer("scorn"), vocabulary.has_extra_guesses()
+(False, True)
+"""
+
+from __future__ import annotations
+import functools
+import hashlib
+from array import array
+from typing import Iterable, TypeAlias
+
+from wordle import kernel
+from wordle.evaluate import feedback
+
+WORD_LENGTH = 5
+
+
+# Ids of a set of words, 2 bytes per word.
+Words: TypeAlias = "array[int]"
+
+
+def new_words(ids: Iterable[int] = ()) -> Words:
+    return array("H", ids)
+
+
+class Vocabulary:
+    """Allowed guesses, possible answers and their integer ids.
+
+    ``letters`` packs the words as a ``uint8[N, 5]`` array, row-major.
+    Feedback of a guess against every answer is computed once per guess,
+    by ``wordle.kernel`` if NumPy is installed, and kept as a row of one
+    byte codes.
+
+    ``version`` identifies the words and answers, whatever their order, so
+    artifacts computed for other word lists can be told apart.
+
+    """
+
+    def __init__(
+        self,
+        words: Iterable[str],
+        answers: Iterable[str] | None = None,
+    ) -> None:
+        guesses = list(words)
+        answers = guesses if answers is None else list(answers)
+        self.words = list(dict.fromkeys(answers + guesses))
+        self.answers = new_words(range(len(dict.fromkeys(answers))))
+        if len(self.words) > 2**16:
+            raise ValueError("Vocabularies over 65536 words not supported.")
+        if any(len(w) != WORD_LENGTH for w in self.words):
+            raise ValueError(f"Words must be {WORD_LENGTH} letters long.")
+        self.ids = {w: i for i, w in enumerate(self.words)}
+        self.letters = "".join(self.words).encode("ascii")
+        self.distinct = bytes(len(set(w)) for w in self.words)
+        self._rows: dict[int, bytes] = {}
+
+    @functools.cached_property
+    def version(self) -> str:
+        h = hashlib.sha1(b"|answers|")
+        h.update(",".join(sorted(self.decode(self.answers))).encode())
+        h.update(b"|guesses|")
+        guesses = self.words[len(self.answers) :]
+        h.update(",".join(sorted(guesses)).encode())
+        return h.hexdigest()[:16]
+
+    @classmethod
+    def from_file(cls, path: str, answers_path: str | None = None) -> Vocabulary:
+        answers = None if answers_path is None else read_words(answers_path)
+        return cls(read_words(path), answers=answers)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.ids
+
+    def is_answer(self, word: str) -> bool:
+        return self.ids.get(word, len(self.answers)) < len(self.answers)
+
+    def has_extra_guesses(self) -> bool:
+        """Whether words other than possible answers may be guessed."""
+        return len(self.answers) < len(self.words)
+
+    def id(self, word: str) -> int:
+        return self.ids[word]
+
+    def word(self, id: int) -> str:
+        return self.words[id]
+
+    def all(self) -> Words:
+        return new_words(range(len(self.words)))
+
+    def encode(self, words: Iterable[str]) -> Words:
+        return new_words(self.ids[w] for w in words)
+
+    def decode(self, ids: Iterable[int]) -> list[str]:
+        return [self.words[i] for i in ids]
+
+    def spelling(self, id: int) -> bytes:
+        start = id * WORD_LENGTH
+        stop = start + WORD_LENGTH
+        return self.letters[start:stop]
+
+    def row(self, guess: int) -> bytes:
+        """Feedback code of ``guess`` against every answer, indexed by id."""
+        if (row := self._rows.get(guess)) is None:
+            g = self.spelling(guess)
+            letters = self.letters
+            end = len(self.answers) * WORD_LENGTH
+            if kernel.AVAILABLE:
+                row = kernel.row(g, kernel.spellings(letters[:end]))
+            else:
+                starts = range(0, end, WORD_LENGTH)
+                stops = range(WORD_LENGTH, end + 1, WORD_LENGTH)
+                row = bytes(
+                    feedback(letters[start:stop], g)
+                    for start, stop in zip(starts, stops)
+                )
+            self._rows[guess] = row
+        return row
+
+    def feedbacks(self, guess: int, aims: Words) -> bytes:
+        """Feedback codes of ``guess`` against some words, without caching."""
+        if (row := self._rows.get(guess)) is not None:
+            return bytes(row[aim] for aim in aims)
+        g = self.spelling(guess)
+        if kernel.AVAILABLE:
+            return kernel.row(g, kernel.spellings(self.letters, aims))
+        return bytes(feedback(self.spelling(aim), g) for aim in aims)
+
+    def feedback(self, guess: int, aim: int) -> int:
+        return self.row(guess)[aim]
+
+    def clear(self) -> None:
+        """Forget the cached feedback rows."""
+        self._rows.clear()
+
+    def table(self) -> dict[str, bytes]:
+        """Cached feedback rows by guess, columns in the order of ``answers``."""
+        return {self.words[guess]: row for guess, row in self._rows.items()}
+
+    def reuse(self, answers: list[str], table: dict[str, bytes]) -> int:
+        """Take over feedback rows computed for other word lists.
+
+        ``table`` are rows by guess, as from ``table``, against ``answers``.
+        Rows of guesses no longer allowed and columns of answers no longer
+        possible are dropped, only columns of new answers are computed.
+        Returns the number of rows taken over.
+
+        >>> old = Vocabulary(["abbot", "scorn", "today"])
+        >>> _ = old.row(old.id("scorn")), old.row(old.id("today"))
+        >>> new = Vocabulary(["abbot", "today", "crate"], answers=["today", "crate"])
+        >>> new.reuse(old.decode(old.answers), old.table())
+        1
+        >>> fresh = Vocabulary(new.words, answers=["today", "crate"])
+        >>> new.row(new.id("today")) == fresh.row(fresh.id("today"))
+        True
+        """
+        columns = {w: i for i, w in enumerate(answers)}
+        kept = [columns.get(w) for w in self.decode(self.answers)]
+        same = kept == list(range(len(answers)))
+        taken = 0
+        for word, old in table.items():
+            if (guess := self.ids.get(word)) is None:
+                continue
+            if same:
+                row = old
+            else:
+                g = self.spelling(guess)
+                row = bytes(
+                    (
+                        feedback(self.spelling(aim), g)
+                        if column is None
+                        else old[column]
+                    )
+                    for aim, column in zip(self.answers, kept)
+                )
+            self._rows[guess] = row
+            taken += 1
+        return taken
+
+    def __getstate__(self) -> dict[str, object]:
+        # rows are cheap to recompute and expensive to send to other processes
+        return {**self.__dict__, "_rows": {}}
+
+
+def read_words(path: str) -> list[str]:
+    with open(path) as f:
+        return [line.strip().lower() for line in f if line.strip()]
@@ -1,40 +1,44 @@
-CORRECT_GUESS = "====="
+from typing import Sequence
 
-def prune_correct(words: list[str], i: int, c: str) -> list[str]:
-    return [w for w in words if w[i] == c]
+from wordle.evaluate import CORRECT_CODE
+from wordle.models import Vocabulary, Words, new_words
 
-
-def prune_present(words: list[str], i: int, c: str) -> list[str]:
-    return [w for w in words if c in w and w[i] != c]
-
-
-def prune_missing(
-    words: list[str], i: int, c: str, status: str, guess: str
-) -> list[str]:
-    # Character with missing may be present elsewhere in the word
-    # return [w for w in words if w[i] != c]
-    if [s for s, c_ in zip(status, guess) if c_ == c and s != "."]:
-        return [w for w in words if c in w and w[i] != c]
-    return [w for w in words if c not in w]
+CORRECT_GUESS = CORRECT_CODE
 
 
 def prune(
-    words: list[str],
-    guesses: list[str],
-    statuses: list[str],
-) -> list[str]:
+    vocabulary: Vocabulary,
+    words: Words,
+    guesses: Sequence[int],
+    statuses: Sequence[int],
+) -> Words:
+    """Words consistent with the feedback for every guess."""
     for guess, status in zip(guesses, statuses):
-        if status == CORRECT_GUESS:
-            return [guess]
-        else:
-            words = [w for w in words if w != guess]
-
-        for i, (c, s) in enumerate(zip(guess, status)):
-            match s:
-                case "=":
-                    words = prune_correct(words, i, c)
-                case "-":
-                    words = prune_present(words, i, c)
-                case ".":
-                    words = prune_missing(words, i, c, status, guess)
+        row = vocabulary.row(guess)
+        words = new_words(w for w in words if row[w] == status)
     return words
+
+
+def partition(vocabulary: Vocabulary, guess: int, words: Words) -> dict[int, Words]:
+    """Words grouped by the feedback they would give ``guess``."""
+    row = vocabulary.row(guess)
+    buckets: dict[int, Words] = {}
+    for w in words:
+        if (bucket := buckets.get(row[w])) is None:
+            bucket = buckets[row[w]] = new_words()
+        bucket.append(w)
+    return buckets
+
+
+def bucket_sizes(vocabulary: Vocabulary, guess: int, words: Words) -> list[int]:
+    """Sizes of the buckets of ``partition``, without building them."""
+    row = vocabulary.row(guess)
+    counts = [0] * 243
+    for w in words:
+        counts[row[w]] += 1
+    return [c for c in counts if c]
+
+
+def expected_size(sizes: list[int]) -> float:
+    """Expected number of words left given bucket sizes."""
+    return sum(c * c for c in sizes) / sum(sizes)
@@ -0,0 +1,209 @@
+"""Rank opening words by how they partition the answers.
+
+>>> vocabulary = Vocabulary(["abbot", "scorn", "today", "rider", "dizzy", "crime"])
+>>> answers = vocabulary.all()
+>>> vocabulary = Vocabulary(vocabulary.words + ["crate"])
+>>> r = metrics(vocabulary, vocabulary.id("crate"), answers)
+>>> r.worst, r.buckets
+(2, 5)
+>>> round(r.expected, 3), round(r.entropy, 3)
+(1.333, 2.252)
+"""
+
+from __future__ import annotations
+import argparse
+import csv
+import hashlib
+import logging
+import math
+import multiprocessing
+import os
+from typing import Iterable, Iterator, NamedTuple
+
+from wordle import kernel
+from wordle.models import Vocabulary, Words, new_words
+
+logger = logging.getLogger(__name__)
+
+
+FIELDS = ["guess", "worst", "expected", "entropy", "buckets"]
+# First line of a checkpoint, before the CSV, naming the answers ranked on.
+ANSWERS_HEADER = "# answers "
+SORT_KEYS = {
+    "worst": lambda r: (r.worst, r.expected, r.guess),
+    "expected": lambda r: (r.expected, r.worst, r.guess),
+    "entropy": lambda r: (-r.entropy, r.expected, r.guess),
+    "buckets": lambda r: (-r.buckets, r.expected, r.guess),
+}
+
+
+class Ranking(NamedTuple):
+    guess: str
+    worst: int
+    expected: float
+    entropy: float
+    buckets: int
+
+    @classmethod
+    def from_row(cls, row: dict[str, str]) -> Ranking:
+        return cls(
+            guess=row["guess"],
+            worst=int(row["worst"]),
+            expected=float(row["expected"]),
+            entropy=float(row["entropy"]),
+            buckets=int(row["buckets"]),
+        )
+
+
+def metrics(vocabulary: Vocabulary, guess: int, answers: Words) -> Ranking:
+    """Partition metrics of a guess over the answers.
+
+    ``expected`` is the expected number of answers left after the guess,
+    ``entropy`` the expected information in bits.
+
+    """
+    counts = [0] * 243
+    for status in vocabulary.feedbacks(guess, answers):
+        counts[status] += 1
+    return ranking(vocabulary.word(guess), counts)
+
+
+def ranking(guess: str, counts: list[int]) -> Ranking:
+    """Metrics of a guess from the number of answers giving each feedback."""
+    counts = [c for c in counts if c]
+    n = sum(counts)
+    return Ranking(
+        guess=guess,
+        worst=max(counts),
+        expected=sum(c * c for c in counts) / n,
+        entropy=-sum(c / n * math.log2(c / n) for c in counts),
+        buckets=len(counts),
+    )
+
+
+_vocabulary = Vocabulary([])
+_answers = new_words()
+
+
+def _init_worker(vocabulary: Vocabulary, answers: Words) -> None:
+    global _vocabulary, _answers
+    _vocabulary = vocabulary
+    _answers = answers
+
+
+def _rank_chunk(guesses: list[str]) -> list[Ranking]:
+    if not kernel.AVAILABLE:
+        return [metrics(_vocabulary, _vocabulary.id(g), _answers) for g in guesses]
+    letters = _vocabulary.letters
+    counts = kernel.partition_counts(
+        kernel.spellings(letters, _vocabulary.encode(guesses)),
+        kernel.spellings(letters, _answers),
+    )
+    return [ranking(g, c) for g, c in zip(guesses, counts.tolist())]
+
+
+def fingerprint(answers: Iterable[str]) -> str:
+    """Identifies a set of answers, whatever their order."""
+    return hashlib.sha1(",".join(sorted(set(answers))).encode()).hexdigest()
+
+
+def read_rankings(path: str, answers: list[str] | None = None) -> Iterator[Ranking]:
+    """Rankings saved at ``path``, if any.
+
+    With ``answers`` the file is a checkpoint, it must have been ranked on
+    the same answers. A last row cut short, without its line end, was being
+    written when a run was interrupted and is skipped.
+
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, newline="") as f:
+        lines = f.readlines()
+    if lines and not lines[-1].endswith("\n"):
+        logger.warning("skipping half written row %r of %s", lines.pop(), path)
+    if answers is not None:
+        header = lines.pop(0) if lines else ""
+        if header.strip() != ANSWERS_HEADER + fingerprint(answers):
+            raise ValueError(f"Checkpoint {path} is not of these answers.")
+    for row in csv.DictReader(lines):
+        yield Ranking.from_row(row)
+
+
+def write_rankings(
+    path: str, rankings: Iterable[Ranking], answers: list[str] | None = None
+) -> None:
+    """Write ``rankings`` to ``path``, as a checkpoint of ``answers`` if given."""
+    with open(path, "w", newline="") as f:
+        if answers is not None:
+            f.write(ANSWERS_HEADER + fingerprint(answers) + "\n")
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(rankings)
+
+
+def chunked(items: list[str], size: int) -> Iterator[list[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def rank(
+    guesses: list[str],
+    answers: list[str],
+    checkpoint: str,
+    processes: int | None = None,
+    chunk_size: int = 64,
+) -> list[Ranking]:
+    """Rank every guess, resuming from and appending to ``checkpoint``.
+
+    Rows are flushed to the checkpoint as each chunk completes so
+    an interrupted run picks up where it stopped. A checkpoint of other
+    answers is refused with a ValueError.
+
+    """
+    rankings = {r.guess: r for r in read_rankings(checkpoint, answers)}
+    todo = [g for g in dict.fromkeys(guesses) if g not in rankings]
+    logger.info("resuming with %s ranked, %s to do", len(rankings), len(todo))
+    vocabulary = Vocabulary(guesses, answers=answers)
+    chunks = list(chunked(todo, chunk_size))
+    # written afresh, without any half written row, before appending to it
+    write_rankings(f"{checkpoint}.tmp", rankings.values(), answers)
+    os.replace(f"{checkpoint}.tmp", checkpoint)
+    with open(checkpoint, "a", newline="") as f:
+        writer = csv.writer(f)
+        with multiprocessing.Pool(
+            processes=processes,
+            initializer=_init_worker,
+            initargs=(vocabulary, vocabulary.answers),
+        ) as pool:
+            for i, chunk in enumerate(pool.imap_unordered(_rank_chunk, chunks)):
+                writer.writerows(chunk)
+                f.flush()
+                rankings.update((r.guess, r) for r in chunk)
+                logger.info("chunk %s/%s", i + 1, len(chunks))
+    return [rankings[g] for g in dict.fromkeys(guesses)]
+
+
+cli = argparse.ArgumentParser(description="Rank opening words.")
+cli.add_argument("--guesses", default="words/words.txt")
+cli.add_argument("--answers", default="words/words-tiny.txt")
+cli.add_argument("--output", default="rankings.csv")
+cli.add_argument("--checkpoint", help="Defaults to the output path + '.partial'.")
+cli.add_argument("--sort-by", choices=list(SORT_KEYS), default="expected")
+cli.add_argument("--processes", type=int)
+cli.add_argument("--chunk-size", type=int, default=64)
+cli.add_argument("--log-level", default="WARNING")
+
+
+if __name__ == "__main__":
+    args = cli.parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+    checkpoint = args.checkpoint or f"{args.output}.partial"
+    rankings = rank(
+        guesses=Vocabulary.from_file(args.guesses).words,
+        answers=Vocabulary.from_file(args.answers).words,
+        checkpoint=checkpoint,
+        processes=args.processes,
+        chunk_size=args.chunk_size,
+    )
+    write_rankings(args.output, sorted(rankings, key=SORT_KEYS[args.sort_by]))
+    os.remove(checkpoint)
@@ -0,0 +1,222 @@
+"""Exact worst-case solver.
+
+An AND/OR search over candidate sets: the guesser (OR) needs one guess for
+which every feedback bucket (AND) can be solved with one guess fewer.
+
+>>> vocabulary = Vocabulary(["abbot", "scorn", "today", "rider", "dizzy", "crime"])
+>>> words = vocabulary.all()
+>>> strategy = solve(vocabulary, words, guesses=words, depth=3)
+>>> strategy is not None
+True
+>>> strategy.depth() <= 3
+True
+>>> solve(vocabulary, words, guesses=words, depth=1) is None
+True
+"""
+
+from __future__ import annotations
+import argparse
+import logging
+from typing import Any, Iterator
+
+from wordle.evaluate import decode, encode
+from wordle.models import Vocabulary, Words, new_words
+from wordle.prune import CORRECT_GUESS, partition
+
+logger = logging.getLogger(__name__)
+
+
+class Strategy:
+    """Proof tree: a guess and the strategy to follow for each feedback."""
+
+    def __init__(self, guess: int, branches: dict[int, Strategy]) -> None:
+        self.guess = guess
+        self.branches = branches
+        self._depth = 1 + max((b.depth() for b in branches.values()), default=0)
+
+    def depth(self) -> int:
+        """Worst case number of guesses, this one included."""
+        return self._depth
+
+    def lines(self, vocabulary: Vocabulary, indent: str = "") -> Iterator[str]:
+        yield f"{indent}{vocabulary.word(self.guess)}"
+        for status, branch in sorted(self.branches.items()):
+            yield f"{indent}  {decode(status)}"
+            yield from branch.lines(vocabulary, indent + "    ")
+
+    def format(self, vocabulary: Vocabulary) -> str:
+        return "\n".join(self.lines(vocabulary))
+
+    def to_dict(self, vocabulary: Vocabulary) -> dict[str, Any]:
+        """JSON friendly form, by words and statuses rather than ids and codes."""
+        return {
+            "guess": vocabulary.word(self.guess),
+            "branches": {
+                decode(status): branch.to_dict(vocabulary)
+                for status, branch in self.branches.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, vocabulary: Vocabulary, data: dict[str, Any]) -> Strategy:
+        return cls(
+            guess=vocabulary.id(data["guess"]),
+            branches={
+                encode(status): cls.from_dict(vocabulary, branch)
+                for status, branch in data["branches"].items()
+            },
+        )
+
+
+class Solver:
+    """Memoised exact solver.
+
+    Solved and failed candidate sets are remembered across calls,
+    keyed by the bytes of their ids in the order given. Buckets keep the
+    order of the words they split, so a set is always met in the same order.
+    A set solvable in ``k`` guesses is solvable in more,
+    a set that fails in ``k`` guesses fails in fewer.
+
+    """
+
+    def __init__(self, vocabulary: Vocabulary, guesses: Words) -> None:
+        self.vocabulary = vocabulary
+        self.guesses = guesses
+        self.solved: dict[bytes, Strategy] = {}
+        self.failed: dict[bytes, int] = {}
+
+    def solve(self, candidates: Words, depth: int) -> Strategy | None:
+        if not candidates or depth < 1:
+            return None
+        if len(candidates) == 1:
+            return Strategy(guess=candidates[0], branches={})
+        key = candidates.tobytes()
+        if (strategy := self.solved.get(key)) and strategy.depth() <= depth:
+            return strategy
+        if self.failed.get(key, 0) >= depth:
+            return None
+        if depth == 1:
+            self.failed[key] = depth
+            return None
+
+        strategy = None
+        for guess, buckets in self.ordered_guesses(candidates, depth):
+            strategy = self.solve_guess(guess, buckets, depth)
+            if strategy is not None:
+                break
+
+        if strategy is None:
+            self.failed[key] = max(self.failed.get(key, 0), depth)
+        else:
+            self.solved[key] = strategy
+        return strategy
+
+    def solve_guess(
+        self,
+        guess: int,
+        buckets: dict[int, Words],
+        depth: int,
+    ) -> Strategy | None:
+        branches: dict[int, Strategy] = {}
+        # largest buckets are the likeliest to fail, try them first
+        for status, bucket in sorted(buckets.items(), key=lambda b: -len(b[1])):
+            if status == CORRECT_GUESS:
+                continue
+            branch = self.solve(bucket, depth - 1)
+            if branch is None:
+                logger.debug("guess=%s fails on %s words", guess, len(bucket))
+                return None
+            branches[status] = branch
+        return Strategy(guess=guess, branches=branches)
+
+    def ordered_guesses(
+        self,
+        candidates: Words,
+        depth: int,
+    ) -> Iterator[tuple[int, dict[int, Words]]]:
+        """Useful guesses, most promising (smallest worst bucket) first."""
+        ranked = []
+        for guess in self.guesses:
+            buckets = partition(self.vocabulary, guess, candidates)
+            worst = max(len(b) for b in buckets.values())
+            is_candidate = CORRECT_GUESS in buckets
+            if worst == len(candidates) and not is_candidate:
+                # learns nothing
+                continue
+            # with one guess left after this every bucket must be a singleton
+            if depth == 2 and worst > 1:
+                continue
+            ranked.append((worst, not is_candidate, guess, buckets))
+        ranked.sort(key=lambda r: r[:3])
+        for _, _, guess, buckets in ranked:
+            yield guess, buckets
+
+
+def solve(
+    vocabulary: Vocabulary,
+    candidates: Words,
+    guesses: Words,
+    depth: int,
+) -> Strategy | None:
+    """Strategy finding every candidate in at most ``depth`` guesses, or None."""
+    return Solver(vocabulary, guesses=guesses).solve(candidates, depth)
+
+
+def prove(
+    vocabulary: Vocabulary,
+    start: int,
+    candidates: Words,
+    guesses: Words,
+    depth: int,
+    solver: Solver | None = None,
+) -> tuple[Strategy | None, Words]:
+    """Try to prove ``start`` solves every candidate within ``depth`` guesses.
+
+    Returns the strategy, or None and the words in the first failing bucket.
+
+    >>> vocabulary = Vocabulary(["abbot", "scorn", "today", "rider", "crate"])
+    >>> words = vocabulary.all()
+    >>> strategy, failed = prove(vocabulary, 4, words, words, depth=3)
+    >>> vocabulary.word(strategy.guess), list(failed)
+    ('crate', [])
+    """
+    solver = Solver(vocabulary, guesses=guesses) if solver is None else solver
+    buckets = partition(vocabulary, start, candidates)
+    branches: dict[int, Strategy] = {}
+    for status, bucket in sorted(buckets.items(), key=lambda b: -len(b[1])):
+        if status == CORRECT_GUESS:
+            continue
+        branch = solver.solve(bucket, depth - 1)
+        if branch is None:
+            return None, bucket
+        branches[status] = branch
+    return Strategy(guess=start, branches=branches), new_words()
+
+
+cli = argparse.ArgumentParser(description="Prove a start word solves all words.")
+cli.add_argument("start")
+cli.add_argument("--vocabulary", default="words/words-tiny.txt", help="Guesses.")
+cli.add_argument("--answers", help="Possible answers, the vocabulary if not given.")
+cli.add_argument("--depth", type=int, default=6)
+cli.add_argument("--show", action="store_true", help="Print the proof tree.")
+cli.add_argument("--log-level", default="WARNING")
+
+
+if __name__ == "__main__":
+    args = cli.parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+    vocabulary = Vocabulary.from_file(args.vocabulary, answers_path=args.answers)
+    strategy, failed = prove(
+        vocabulary,
+        start=vocabulary.id(args.start),
+        candidates=vocabulary.answers,
+        guesses=vocabulary.all(),
+        depth=args.depth,
+    )
+    if strategy is None:
+        failed_words = vocabulary.decode(failed)
+        print(f"'{args.start}' fails within {args.depth} guesses on: {failed_words}")
+    else:
+        print(f"'{args.start}' solves all words within {strategy.depth()} guesses")
+        if args.show:
+            print(strategy.format(vocabulary))
@@ -1,4 +1,6 @@
 from wordle.board import Board
+from wordle.cache import SolvedCache
+from wordle.models import Vocabulary
 
 
 def wordle(
@@ -6,20 +8,32 @@ def wordle(
     aim: str,
     initial_guess: str,
     soft: bool,
+    guesses: list[str] | None = None,
+    cache: SolvedCache | None = None,
 ) -> Board:
+    """Play for ``aim`` among the possible answers ``words``.
+
+    ``guesses`` are extra allowed guesses, by default only the answers left.
+    Searched positions are read from and written to ``cache`` if given.
+
+    """
     if aim not in words:
         raise ValueError("Aim not in words, might struggle.")
 
+    vocabulary = Vocabulary(words if guesses is None else guesses, answers=words)
     board = Board(
-        words=words,
+        vocabulary=vocabulary,
+        words=vocabulary.answers,
         moves=[],
         statuses=[],
-        initial_guess=initial_guess,
+        initial_guess=vocabulary.id(initial_guess),
+        guesses=vocabulary.all() if vocabulary.has_extra_guesses() else None,
     )
 
+    aim_id = vocabulary.id(aim)
     while True:
-        board = board.guess(soft)
-        board = board.evaluate(aim)
+        board = board.guess(soft, cache=cache)
+        board = board.evaluate(aim_id)
         # print(board)
         if board.is_terminal():
             break